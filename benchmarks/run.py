@@ -0,0 +1,306 @@
+"""Overhead benchmarks for the tasklogger hot paths.
+
+Measures the time per call of the task and message functions across
+logging levels, nesting depths, indentation, output streams and numbers of
+concurrent threads, excluding the cost of the work being timed, as well
+as the time to import tasklogger.
+
+Usage::
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json --threshold 0.1
+
+With ``--compare``, each benchmark is compared to the baseline results and
+the script exits with status 1 if any is slower by more than ``--threshold``.
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tasklogger
+import tempfile
+import threading
+import time
+
+LEVELS = {"INFO": 1, "WARNING": 0, "IGNORE": -3}
+
+_names = itertools.count()
+
+
+def _make_stream(stream, tempdir):
+    if stream == "stringio":
+        return io.StringIO()
+    elif stream == "file":
+        return open(os.path.join(tempdir, "bench_{}.log".format(next(_names))), "w")
+    elif stream == "devnull":
+        return open(os.devnull, "w")
+    else:
+        raise ValueError(stream)
+
+
+def _make_op(op, logger):
+    if op == "start_complete":
+
+        def fn():
+            logger.start_task("task")
+            logger.complete_task("task")
+
+    elif op == "log_task":
+
+        def fn():
+            with logger.log_task("task"):
+                pass
+
+    elif op == "timed":
+
+        @logger.timed(name="task")
+        def fn():
+            pass
+
+    elif op == "log_info":
+
+        def fn():
+            logger.log_info("message")
+
+    elif op == "api_log_task":
+
+        def fn():
+            with tasklogger.log_task("task", logger=logger.name):
+                pass
+
+    elif op == "api_log_info":
+
+        def fn():
+            tasklogger.log_info("message", logger=logger.name)
+
+    elif op == "api_get_tasklogger":
+
+        def fn():
+            tasklogger.get_tasklogger(logger.name)
+
+    else:
+        raise ValueError(op)
+    return fn
+
+
+def _time_per_call(logger, fn, depth, threads, number):
+    """Time `number` calls of `fn` in each of `threads` threads"""
+    barrier = threading.Barrier(threads + 1)
+    done = threading.Barrier(threads + 1)
+
+    def target():
+        for i in range(depth):
+            logger.start_task("parent {}".format(i))
+        barrier.wait()
+        for _ in range(number):
+            fn()
+        done.wait()
+        for i in reversed(range(depth)):
+            logger.complete_task("parent {}".format(i))
+
+    workers = [threading.Thread(target=target) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    done.wait()
+    elapsed = time.perf_counter() - start
+    for worker in workers:
+        worker.join()
+    return elapsed / (number * threads)
+
+
+def benchmark(
+    op,
+    level="INFO",
+    stream="stringio",
+    depth=0,
+    indent=2,
+    threads=1,
+    min_runtime=0,
+    defer_start=False,
+    number=10000,
+    repeat=5,
+    tempdir=None,
+):
+    """Measure the time per call of an operation
+
+    Returns
+    -------
+    ns_per_call : float
+        Best time per call over `repeat` runs, in nanoseconds
+    """
+    logger = tasklogger.TaskLogger(
+        "bench_{}".format(next(_names)),
+        level=LEVELS[level],
+        stream=_make_stream(stream, tempdir),
+        indent=indent,
+        min_runtime=min_runtime,
+        defer_start=defer_start,
+    )
+    fn = _make_op(op, logger)
+    try:
+        return 1e9 * min(
+            _time_per_call(logger, fn, depth, threads, number) for _ in range(repeat)
+        )
+    finally:
+        # releases the logging.Logger and stops the watchdog scanning it
+        logger.close()
+        if logger.stream is not sys.stdout:
+            logger.stream.close()
+
+
+def import_time(repeat=5):
+    """Measure the time to import tasklogger in a new interpreter
+
+    Returns
+    -------
+    ns : float
+        Best cumulative import time of tasklogger over `repeat` runs, as
+        reported by ``python -X importtime``, in nanoseconds
+    """
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import tasklogger"],
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stderr
+        for line in output.splitlines():
+            _, cumulative, name = line.split("|")
+            if name.strip() == "tasklogger":
+                times.append(int(cumulative) * 1000)
+    return min(times)
+
+
+def cases():
+    """Benchmark cases as (name, parameters)"""
+    ops = [
+        "start_complete",
+        "log_task",
+        "timed",
+        "log_info",
+        "api_log_task",
+        "api_log_info",
+        "api_get_tasklogger",
+    ]
+    params = []
+    for level in LEVELS:
+        for op in ops:
+            params.append(dict(op=op, level=level))
+    for stream in ["file", "devnull"]:
+        for op in ["start_complete", "log_info"]:
+            params.append(dict(op=op, stream=stream))
+    for depth in [5, 20]:
+        for level in ["INFO", "WARNING"]:
+            params.append(dict(op="start_complete", level=level, depth=depth))
+    for op in ["start_complete", "log_info"]:
+        params.append(dict(op=op, indent=0))
+    params.append(dict(op="start_complete", min_runtime=0.01))
+    params.append(dict(op="start_complete", min_runtime=0.01, defer_start=True))
+    for threads in [4]:
+        for level in ["INFO", "WARNING"]:
+            for op in ["start_complete", "api_log_info"]:
+                params.append(dict(op=op, level=level, threads=threads))
+    for param in params:
+        name = "{}[{}]".format(
+            param["op"],
+            ",".join(
+                "{}={}".format(key, value)
+                for key, value in param.items()
+                if key != "op"
+            ),
+        )
+        yield name, param
+
+
+def run(pattern=None, number=10000, repeat=5):
+    results = {}
+    with tempfile.TemporaryDirectory() as tempdir:
+        for name, param in cases():
+            if pattern is not None and not re.search(pattern, name):
+                continue
+            ns_per_call = benchmark(
+                number=number, repeat=repeat, tempdir=tempdir, **param
+            )
+            results[name] = {"ns_per_call": ns_per_call}
+            print("{:<60} {:>10.0f} ns/call".format(name, ns_per_call))
+    name = "import"
+    if pattern is None or re.search(pattern, name):
+        ns_per_call = import_time(repeat=repeat)
+        results[name] = {"ns_per_call": ns_per_call}
+        print("{:<60} {:>10.0f} ns/call".format(name, ns_per_call))
+    return {
+        "tasklogger": tasklogger.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change from `baseline` of each benchmark
+
+    Returns
+    -------
+    regressions : list of str
+        Names of the benchmarks slower than `baseline` by more than `threshold`
+    """
+    regressions = []
+    for name, result in results["results"].items():
+        try:
+            before = baseline["results"][name]["ns_per_call"]
+        except KeyError:
+            continue
+        after = result["ns_per_call"]
+        change = after / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " REGRESSION"
+        print(
+            "{:<60} {:>10.0f} -> {:>10.0f} ns/call ({:+.1%}){}".format(
+                name, before, after, change, flag
+            )
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare to results in this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression (default: 0.1)",
+    )
+    parser.add_argument("--filter", help="only run benchmarks matching this regex")
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(pattern=args.filter, number=args.number, repeat=args.repeat)
+    if args.output is not None:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("{} regressions".format(len(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,7 @@
+from . import sampling
 from .api import *  # noqa
+from .collector import TaskCollector
+from .executor import TaskExecutor
 from .logger import TaskLogger
 from .version import __version__
 from functools import partial
@@ -16,12 +16,16 @@ def get_tasklogger(name="TaskLogger"):
     logger : TaskLogger
     """
     try:
-        return logging.getLogger(name).tasklogger
-    except AttributeError:
-        return logger.TaskLogger(name)
+        return logger._registry[name]
+    except KeyError:
+        with logger._registry_lock:
+            try:
+                return logging.getLogger(name).tasklogger
+            except AttributeError:
+                return logger.TaskLogger(name)
 
 
-def log_start(task, logger="TaskLogger"):
+def log_start(task, logger="TaskLogger", sample=None):
     """Begin logging of a task
 
     Convenience function to log a task in the default
@@ -33,13 +37,15 @@ def log_start(task, logger="TaskLogger"):
         Name of the task to be started
     logger : str, optional (default: "TaskLogger")
         Unique name of the logger to retrieve
+    sample : `tasklogger.sampling.SamplingPolicy`, optional (default: None)
+        Policy deciding whether this call is logged
 
     Returns
     -------
     logger : TaskLogger
     """
     tasklogger = get_tasklogger(logger)
-    tasklogger.start_task(task)
+    tasklogger.start_task(task, sample=sample)
     return tasklogger
 
 
@@ -51,8 +57,9 @@ def log_complete(task, logger="TaskLogger"):
 
     Parameters
     ----------
-    task : str
-        Name of the task to be started
+    task : str or `tasklogger.logger.TaskHandle`
+        Name of the task to be completed, or the handle returned by
+        `TaskLogger.start_task`
     logger : str, optional (default: "TaskLogger")
         Unique name of the logger to retrieve
 
@@ -65,7 +72,9 @@ def log_complete(task, logger="TaskLogger"):
     return tasklogger.complete_task(task)
 
 
-def log_task(task, logger="TaskLogger"):
+def log_task(
+    task, logger="TaskLogger", sample=None, items=None, nbytes=None, unit="items"
+):
     """Context manager for logging a task
 
     Times the action within the context frame
@@ -76,6 +85,14 @@ def log_task(task, logger="TaskLogger"):
         Name of the task to be started
     logger : str, optional (default: "TaskLogger")
         Unique name of the logger to retrieve
+    sample : `tasklogger.sampling.SamplingPolicy`, optional (default: None)
+        Policy deciding whether this call is logged
+    items : int, optional (default: None)
+        Number of items processed, to report the number of items per second
+    nbytes : int, optional (default: None)
+        Number of bytes processed, to report the number of bytes per second
+    unit : str, optional (default: "items")
+        Name of the items
 
     Examples
     --------
@@ -87,7 +104,101 @@ def log_task(task, logger="TaskLogger"):
     Calculated test in 1.00 seconds.
     """
     tasklogger = get_tasklogger(logger)
-    return tasklogger.log_task(task)
+    return tasklogger.log_task(
+        task, sample=sample, items=items, nbytes=nbytes, unit=unit
+    )
+
+
+def log_iter(
+    iterable, task, total=None, interval=10, unit="items", logger="TaskLogger"
+):
+    """Log the progress of a task which iterates over `iterable`
+
+    Yields the items of `iterable` unchanged, periodically logging the
+    number of items processed, the throughput and the time remaining
+
+    Parameters
+    ----------
+    iterable : iterable
+        Items to iterate over
+    task : str
+        Name of the task
+    total : int, optional (default: None)
+        Total number of items. Defaults to `len(iterable)`, if defined.
+    interval : float, optional (default: 10)
+        Time in seconds between progress messages
+    unit : str, optional (default: "items")
+        Name of the items
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Examples
+    --------
+    >>> import tasklogger
+    >>> for record in tasklogger.log_iter(records, 'processing records'):
+    ...     process(record)
+    """
+    tasklogger = get_tasklogger(logger)
+    return tasklogger.log_iter(
+        iterable, task, total=total, interval=interval, unit=unit
+    )
+
+
+def log_task_async(task, logger="TaskLogger"):
+    """Asynchronous context manager for logging a task
+
+    Times the action within the context frame, keeping the timings of each
+    `asyncio.Task` separate
+
+    Parameters
+    ----------
+    task : str
+        Name of the task to be started
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> import tasklogger
+    >>> async def main():
+    ...     async with tasklogger.log_task_async('test'):
+    ...         await asyncio.sleep(1)
+    >>> asyncio.run(main())
+    Calculating test...
+    Calculated test in 1.00 seconds.
+    """
+    tasklogger = get_tasklogger(logger)
+    return tasklogger.log_task_async(task)
+
+
+def timed(func=None, name=None, logger="TaskLogger"):
+    """Decorator for logging each call of a function as a task
+
+    The TaskLogger is retrieved once, when the function is decorated.
+
+    Parameters
+    ----------
+    func : callable, optional
+        Function to be timed. If not given, returns a decorator.
+    name : str, optional (default: None)
+        Name of the task. Defaults to the function's qualified name.
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Examples
+    --------
+    >>> import tasklogger
+    >>> import time
+    >>> @tasklogger.timed(name="test")
+    ... def sleep():
+    ...     time.sleep(1)
+    >>> sleep()
+    Calculating test...
+    Calculated test in 1.00 seconds.
+    """
+    tasklogger = get_tasklogger(logger)
+    return tasklogger.timed(func, name=name)
 
 
 def log_debug(msg, logger="TaskLogger"):
@@ -223,9 +334,14 @@ def set_timer(timer="wall", logger="TaskLogger"):
 
     Parameters
     ----------
-    timer : {'wall', 'cpu', or callable}, optional, default='wall'
+    timer : {'wall', 'cpu', 'perf', 'monotonic', 'thread', 'resources', \
+            or callable}, optional, default='wall'
             Timer function used to measure task running times.
-            'wall' uses `time.time`, 'cpu' uses `time.process_time`
+            'wall' uses `time.time`, 'cpu' uses `time.process_time`,
+            'perf' uses `time.perf_counter_ns`, 'monotonic' uses
+            `time.monotonic_ns` and 'thread' uses `time.thread_time_ns`.
+            'resources' measures wall time, CPU time and resource usage
+            together.
 
     Returns
     -------
@@ -236,6 +352,208 @@ def set_timer(timer="wall", logger="TaskLogger"):
     return tasklogger
 
 
+def set_aggregate(aggregate=True, logger="TaskLogger"):
+    """Set whether to aggregate task runtimes rather than print them
+
+    Convenience function to turn aggregate mode on or off
+
+    Parameters
+    ----------
+    aggregate : bool, optional (default: True)
+        If True, print nothing when tasks start or complete and instead keep
+        a summary of runtimes for each task name, printed by `log_summary`
+        and at exit
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.set_aggregate(aggregate)
+    return tasklogger
+
+
+def log_summary(reset=False, logger="TaskLogger"):
+    """Log a summary table of aggregated task runtimes
+
+    Convenience function to print the summary of the default TaskLogger
+
+    Parameters
+    ----------
+    reset : bool, optional (default: False)
+        If True, clear the summaries once printed
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.log_summary(reset=reset)
+    return tasklogger
+
+
+def set_background_output(
+    background=True,
+    maxsize=10000,
+    overflow="block",
+    flush_interval=0.1,
+    logger="TaskLogger",
+):
+    """Set whether messages are written from a background thread
+
+    Convenience function to turn background output on or off
+
+    Parameters
+    ----------
+    background : bool, optional (default: True)
+        If True, queue messages and write them in batches from a
+        background thread
+    maxsize : int, optional (default: 10000)
+        Maximum number of messages waiting to be written
+    overflow : {"block", "drop-oldest", "count-and-drop"}, \
+        optional (default: "block")
+        Behavior when the queue is full
+    flush_interval : float, optional (default: 0.1)
+        Maximum time in seconds between a write and the next flush
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.set_background_output(
+        background=background,
+        maxsize=maxsize,
+        overflow=overflow,
+        flush_interval=flush_interval,
+    )
+    return tasklogger
+
+
+def set_trace(trace=None, logger="TaskLogger"):
+    """Set a recorder for a Chrome Trace Event timeline of tasks
+
+    Convenience function to record tasks to a trace file, which can be
+    opened in Perfetto or chrome://tracing
+
+    Parameters
+    ----------
+    trace : str, `tasklogger.trace.TraceRecorder` or None, \
+        optional (default: None)
+        Path of the trace file to write, or a recorder. If None, stop recording.
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.set_trace(trace)
+    return tasklogger
+
+
+def set_watchdog(after=60, growth=2, stacks=False, logger="TaskLogger"):
+    """Set whether to report tasks which run for a long time
+
+    Convenience function to log "Still calculating X (elapsed 5m)..."
+    for tasks running for longer than `after` seconds
+
+    Parameters
+    ----------
+    after : float or None, optional (default: 60)
+        Running time in seconds of the first report. If None, stop reporting.
+    growth : float, optional (default: 2)
+        Factor by which the running time grows between reports
+    stacks : bool, optional (default: False)
+        If True, also log the stack of the thread running a reported task
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.set_watchdog(after=after, growth=growth, stacks=stacks)
+    return tasklogger
+
+
+def set_history(history=None, logger="TaskLogger"):
+    """Set a persistent history of runtimes to detect regressions
+
+    Convenience function to warn when a task is much slower than in previous
+    runs
+
+    Parameters
+    ----------
+    history : str, `tasklogger.history.RuntimeHistory` or None, \
+        optional (default: None)
+        Path of the SQLite database in which to keep the history, or a
+        history. If None, stop adding runtimes.
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.set_history(history)
+    return tasklogger
+
+
+def set_tree(tree=True, logger="TaskLogger"):
+    """Set whether to aggregate runtimes by path of parent tasks
+
+    Convenience function to build a flame graph of tasks
+
+    Parameters
+    ----------
+    tree : bool, str or `tasklogger.tree.TaskTree`, optional (default: True)
+        If True, keep a new tree. If a path, keep a new tree and write it to
+        that file in collapsed stack format at exit. If a tree, add to it.
+        If False or None, stop adding runtimes.
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.set_tree(tree)
+    return tasklogger
+
+
+def log_tree(sort="self", logger="TaskLogger"):
+    """Log a profile of the tasks aggregated by `set_tree`
+
+    Convenience function to print the self and total time of each path of
+    tasks and the critical path
+
+    Parameters
+    ----------
+    sort : {"self", "total", "count"}, optional (default: "self")
+        Column by which the table is sorted, largest first
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to retrieve
+
+    Returns
+    -------
+    logger : TaskLogger
+    """
+    tasklogger = get_tasklogger(logger)
+    tasklogger.log_tree(sort=sort)
+    return tasklogger
+
+
 def set_indent(indent=2, logger="TaskLogger"):
     """Set the indent function
 
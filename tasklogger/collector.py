@@ -0,0 +1,145 @@
+from . import api
+
+import logging
+import os
+import threading
+
+
+class _ForwardHandler(logging.Handler):
+    """Logging handler which sends formatted messages to a queue"""
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+
+    def emit(self, record):
+        try:
+            self.queue.put(("log", os.getpid(), record.levelno, self.format(record)))
+        except Exception:
+            self.handleError(record)
+
+
+def init_worker(queue, logger="TaskLogger", summary=False):
+    """Send a worker process' TaskLogger output to a `TaskCollector`
+
+    Used as the `initializer` of a `multiprocessing.Pool` or
+    `concurrent.futures.ProcessPoolExecutor`; see `TaskCollector.initargs`.
+
+    Parameters
+    ----------
+    queue : `multiprocessing.Queue`
+        Queue read by the `TaskCollector`
+    logger : str, optional (default: "TaskLogger")
+        Unique name of the logger to forward
+    summary : bool, optional (default: False)
+        If True, only send task runtimes and messages at WARNING or above
+    """
+    tasklogger = api.get_tasklogger(logger)
+    # forked workers inherit the tasks running in the parent
+    tasklogger._reset_threads()
+    if summary:
+        tasklogger.set_level(False)
+    tasklogger._set_handler(_ForwardHandler(queue))
+    # runtimes are only used by a collector which summarizes them
+    tasklogger._forward = queue if summary else None
+
+
+class TaskCollector(object):
+    """Collect task output and timings from worker processes
+
+    Worker processes initialized with `init_worker` send each message and
+    each completed task runtime of their TaskLogger to this collector as a
+    small tuple. A thread in the parent process then logs messages through
+    the parent TaskLogger, indented to the depth at which the collector was
+    created and tagged with the worker's process ID, or adds the runtimes to
+    the parent TaskLogger's summary (see `TaskLogger.log_summary`) under
+    the task name tagged with the worker's process ID.
+
+    Parameters
+    ----------
+    logger : str or TaskLogger, optional (default: "TaskLogger")
+        TaskLogger to collect into. Workers forward the TaskLogger of the
+        same name.
+    summary : bool, optional (default: False)
+        If True, summarize task runtimes rather than logging every message,
+        and log the summary when the collector is closed
+    context : str, optional (default: None)
+        `multiprocessing` start method used to create the queue
+
+    Examples
+    --------
+    >>> import concurrent.futures
+    >>> import tasklogger
+    >>> def work(i):
+    ...     with tasklogger.log_task("work {}".format(i)):
+    ...         pass
+    >>> with tasklogger.log_task("pool"):
+    ...     with tasklogger.TaskCollector() as collector:
+    ...         with concurrent.futures.ProcessPoolExecutor(
+    ...             initializer=collector.initializer,
+    ...             initargs=collector.initargs,
+    ...         ) as pool:
+    ...             list(pool.map(work, range(2)))
+    Calculating pool...
+      [worker 1234] Calculating work 0...
+      [worker 1235] Calculating work 1...
+    Calculated pool in 0.10 seconds.
+    """
+
+    initializer = staticmethod(init_worker)
+
+    def __init__(self, logger="TaskLogger", summary=False, context=None):
+        if isinstance(logger, str):
+            logger = api.get_tasklogger(logger)
+        self.tasklogger = logger
+        self.summary = summary
+        # multiprocessing is slow to import, and only needed here
+        import multiprocessing
+
+        self.queue = multiprocessing.get_context(context).Queue()
+        self._depth = len(logger._local.stack) + len(logger._async_tasks.get())
+        self._thread = threading.Thread(
+            target=self._run, name="tasklogger-collector", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def initargs(self):
+        """Arguments to `init_worker`"""
+        return (self.queue, self.tasklogger.name, self.summary)
+
+    def _run(self):
+        tasklogger = self.tasklogger
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            kind, pid, *data = record
+            if kind == "task":
+                if self.summary:
+                    task, runtime = data
+                    tasklogger._record("{} [worker {}]".format(task, pid), runtime)
+            else:
+                level, msg = data
+                tasklogger._log(
+                    level, "[worker {}] {}".format(pid, msg), depth=self._depth
+                )
+
+    def close(self):
+        """Process all records sent so far and stop collecting
+
+        Call once the worker processes have exited, e.g. after
+        `ProcessPoolExecutor.shutdown`.
+        """
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+            if self.summary:
+                self.tasklogger.log_summary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,221 @@
+from . import api
+from . import stats
+
+import concurrent.futures
+import functools
+import threading
+import time
+
+
+class _Job(object):
+    """Picklable wrapper recording when a job starts and finishes running
+
+    Times are taken with `time.time`, which is comparable between the
+    processes of a `ProcessPoolExecutor`.
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __call__(self, *args, **kwargs):
+        start = time.time()
+        try:
+            result = self.fn(*args, **kwargs)
+        except BaseException as exc:
+            # sent back with the exception, which pickles its __dict__
+            exc._tasklogger_times = (start, time.time())
+            raise
+        return start, time.time(), result
+
+
+class _JobFuture(concurrent.futures.Future):
+    """Future of a job submitted to a `TaskExecutor`"""
+
+    def __init__(self, future):
+        super().__init__()
+        self._future = future
+
+    def cancel(self):
+        return self._future.cancel() and super().cancel()
+
+
+class TaskExecutor(object):
+    """Executor which records how long jobs wait in the queue and run
+
+    Wraps a `concurrent.futures.ThreadPoolExecutor` or `ProcessPoolExecutor`.
+    For each job, the time it is submitted, starts running in a worker and
+    finishes running is recorded. The time spent waiting in the queue, the
+    time spent running and the utilization of the pool are summarized and
+    logged by `log_summary`, which is called when the executor is shut down
+    or exits its context.
+
+    Parameters
+    ----------
+    executor : `concurrent.futures.Executor`
+        Executor to which jobs are submitted
+    logger : str or TaskLogger, optional (default: "TaskLogger")
+        TaskLogger to which the summary is logged
+    name : str, optional (default: "jobs")
+        Name of the jobs in the summary
+    max_workers : int, optional (default: None)
+        Number of workers of `executor`, used to compute its utilization.
+        Defaults to the `max_workers` with which `executor` was created.
+
+    Properties
+    ----------
+    wait : `tasklogger.stats.TaskStats`
+        Time in seconds from submission to the start of each job
+    run : `tasklogger.stats.TaskStats`
+        Time in seconds each job spent running
+    failed : int
+        Number of jobs which raised an exception
+
+    Examples
+    --------
+    >>> import concurrent.futures
+    >>> import tasklogger
+    >>> import time
+    >>> with tasklogger.TaskExecutor(
+    ...     concurrent.futures.ThreadPoolExecutor(2)
+    ... ) as executor:
+    ...     futures = [executor.submit(time.sleep, 1) for _ in range(4)]
+    4 jobs in 2.00 seconds; queue wait mean 0.50, p95 1.00 seconds; run time \
+mean 1.00, p95 1.00 seconds; 100% utilization of 2 workers.
+    """
+
+    def __init__(self, executor, logger="TaskLogger", name="jobs", max_workers=None):
+        if isinstance(logger, str):
+            logger = api.get_tasklogger(logger)
+        self.executor = executor
+        self.tasklogger = logger
+        self.name = name
+        if max_workers is None:
+            max_workers = getattr(executor, "_max_workers", None)
+        self.max_workers = max_workers
+        self.wait = stats.TaskStats()
+        self.run = stats.TaskStats()
+        self.failed = 0
+        self._first_submitted = None
+        self._last_finished = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a job to the executor
+
+        Parameters
+        ----------
+        fn : callable
+            Function to run. With a `ProcessPoolExecutor`, it must be picklable.
+        *args, **kwargs
+            Arguments of `fn`
+
+        Returns
+        -------
+        future : `concurrent.futures.Future`
+            Future of the return value of `fn`
+        """
+        submitted = time.time()
+        with self._lock:
+            if self._first_submitted is None:
+                self._first_submitted = submitted
+        future = self.executor.submit(_Job(fn), *args, **kwargs)
+        job_future = _JobFuture(future)
+        future.add_done_callback(functools.partial(self._done, job_future, submitted))
+        return job_future
+
+    def map(self, fn, *iterables):
+        """Run `fn` on the items of `iterables` as separate jobs
+
+        Returns
+        -------
+        results : iterator
+            Return values of `fn`, in the order of `iterables`
+        """
+        futures = [self.submit(fn, *args) for args in zip(*iterables)]
+
+        def results():
+            for future in futures:
+                yield future.result()
+
+        return results()
+
+    def _done(self, job_future, submitted, future):
+        if future.cancelled():
+            job_future.cancel()
+            return
+        exc = future.exception()
+        if exc is None:
+            start, finish, result = future.result()
+        else:
+            start, finish = getattr(exc, "_tasklogger_times", (submitted, time.time()))
+        with self._lock:
+            self.wait.add(max(start - submitted, 0))
+            self.run.add(finish - start)
+            if exc is not None:
+                self.failed += 1
+            if self._last_finished is None or finish > self._last_finished:
+                self._last_finished = finish
+        if exc is None:
+            job_future.set_result(result)
+        else:
+            job_future.set_exception(exc)
+
+    def utilization(self):
+        """Fraction of the time the workers spent running jobs
+
+        Measured from the first submission to the last completed job
+
+        Returns
+        -------
+        utilization : float
+            Between 0 and 1, or NaN if unknown
+        """
+        with self._lock:
+            if self._last_finished is None or not self.max_workers:
+                return float("nan")
+            elapsed = self._last_finished - self._first_submitted
+            if elapsed <= 0:
+                return float("nan")
+            return self.run.total / (self.max_workers * elapsed)
+
+    def log_summary(self):
+        """Log the queue wait time, run time and utilization of the pool"""
+        with self._lock:
+            count = self.run.count
+            if count == 0:
+                return
+            elapsed = self._last_finished - self._first_submitted
+            msg = "{} {} in {:.2f} seconds".format(count, self.name, elapsed)
+            if self.failed:
+                msg += " ({} failed)".format(self.failed)
+            msg += "; queue wait mean {:.2f}, p95 {:.2f} seconds".format(
+                self.wait.mean, self.wait.quantile(0.95)
+            )
+            msg += "; run time mean {:.2f}, p95 {:.2f} seconds".format(
+                self.run.mean, self.run.quantile(0.95)
+            )
+        utilization = self.utilization()
+        if utilization == utilization:
+            msg += "; {:.0%} utilization of {} workers".format(
+                utilization, self.max_workers
+            )
+        self.tasklogger.log_info(msg + ".")
+
+    def shutdown(self, wait=True):
+        """Shut down the executor
+
+        Parameters
+        ----------
+        wait : bool, optional (default: True)
+            If True, wait for all jobs to finish, then log the summary
+        """
+        self.executor.shutdown(wait=wait)
+        if wait:
+            self.log_summary()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True)
+        return False
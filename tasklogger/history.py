@@ -0,0 +1,195 @@
+import atexit
+import collections
+import math
+import threading
+import time
+
+
+class RuntimeHistory(object):
+    """Persistent history of task runtimes, used to detect regressions
+
+    Every runtime added is appended to a table in an SQLite database, so
+    that runtimes are kept across runs of a program. Rows are written in
+    batches, at most `batch_size` rows or `commit_interval` seconds apart,
+    and when the history is closed, which happens at exit.
+
+    Each runtime is compared to the baseline of the task: the mean and
+    standard deviation of its last `window` runtimes, from this and previous
+    runs. Only this baseline is held in memory.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite database, created if it does not exist
+    window : int, optional (default: 100)
+        Number of previous runtimes of a task in its baseline
+    sigma : float or None, optional (default: 3)
+        A runtime more than `sigma` standard deviations above the mean of
+        the baseline is a regression. If None, the standard deviation is
+        not used.
+    threshold : float or None, optional (default: None)
+        A runtime slower than the mean of the baseline by more than this
+        fraction, e.g. 0.5 for 50%, is a regression. If both `sigma` and
+        `threshold` are given, a runtime exceeding either is a regression.
+    min_count : int, optional (default: 5)
+        Minimum number of runtimes in the baseline before regressions are
+        reported
+    batch_size : int, optional (default: 100)
+        Maximum number of runtimes waiting to be written
+    commit_interval : float, optional (default: 1)
+        Maximum time in seconds between writes, checked when a runtime is
+        added
+    """
+
+    def __init__(
+        self,
+        path,
+        window=100,
+        sigma=3,
+        threshold=None,
+        min_count=5,
+        batch_size=100,
+        commit_interval=1,
+    ):
+        # imported here as sqlite3 is only needed for the history
+        import sqlite3
+
+        if sigma is None and threshold is None:
+            raise ValueError("Expected at least one of sigma and threshold")
+        self.path = path
+        self.window = window
+        self.sigma = sigma
+        self.threshold = threshold
+        self.min_count = max(min_count, 2)
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self._lock = threading.Lock()
+        # last runtimes of each task
+        self._baselines = {}
+        self._pending = []
+        self._last_commit = time.monotonic()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS runtimes "
+                "(task TEXT NOT NULL, runtime REAL NOT NULL, time REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS runtimes_task ON runtimes (task)"
+            )
+        self.closed = False
+        atexit.register(self.close)
+
+    def _load(self, task):
+        """Read the baseline of `task` from the database"""
+        rows = self._connection.execute(
+            "SELECT runtime FROM runtimes WHERE task = ? ORDER BY rowid DESC LIMIT ?",
+            (task, self.window),
+        ).fetchall()
+        return collections.deque(
+            (runtime for (runtime,) in reversed(rows)), maxlen=self.window
+        )
+
+    def baseline(self, task):
+        """Get the baseline of a task
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+
+        Returns
+        -------
+        count : int
+            Number of runtimes in the baseline
+        mean : float
+            Mean runtime
+        std : float
+            Standard deviation of the runtimes
+        """
+        with self._lock:
+            return self._stats(self._get(task))
+
+    def _get(self, task):
+        try:
+            return self._baselines[task]
+        except KeyError:
+            baseline = self._baselines[task] = self._load(task)
+            return baseline
+
+    @staticmethod
+    def _stats(runtimes):
+        count = len(runtimes)
+        if count == 0:
+            return 0, math.nan, math.nan
+        mean = sum(runtimes) / count
+        if count == 1:
+            return count, mean, 0.0
+        variance = sum((runtime - mean) ** 2 for runtime in runtimes) / (count - 1)
+        return count, mean, math.sqrt(variance)
+
+    def add(self, task, runtime):
+        """Add a runtime to the history of a task
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+        runtime : float
+            Runtime of the task
+
+        Returns
+        -------
+        regression : tuple or None
+            If `runtime` is a regression, the `(count, mean, std)` of the
+            baseline it was compared to, otherwise None
+        """
+        task = str(task)
+        runtime = float(runtime)
+        with self._lock:
+            if self.closed:
+                return None
+            runtimes = self._get(task)
+            stats = self._stats(runtimes)
+            regression = self._is_regression(runtime, *stats)
+            runtimes.append(runtime)
+            self._pending.append((task, runtime, time.time()))
+            due = time.monotonic() - self._last_commit >= self.commit_interval
+            if due or len(self._pending) >= self.batch_size:
+                self._commit()
+        return stats if regression else None
+
+    def _is_regression(self, runtime, count, mean, std):
+        if count < self.min_count:
+            return False
+        if self.sigma is not None and runtime > mean + self.sigma * std:
+            return True
+        if self.threshold is not None and runtime > mean * (1 + self.threshold):
+            return True
+        return False
+
+    def _commit(self):
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO runtimes (task, runtime, time) VALUES (?, ?, ?)",
+                    self._pending,
+                )
+            self._pending = []
+        self._last_commit = time.monotonic()
+
+    def flush(self):
+        """Write all runtimes added so far to the database"""
+        with self._lock:
+            if not self.closed:
+                self._commit()
+
+    def close(self):
+        """Write all runtimes added so far and close the database"""
+        with self._lock:
+            if self.closed:
+                return
+            self._commit()
+            self._connection.close()
+            self.closed = True
+        atexit.unregister(self.close)
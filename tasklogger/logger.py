@@ -1,9 +1,34 @@
-from deprecated.sphinx import deprecated
-
+from . import stats
+from . import watchdog
+from . import writer
+from .history import RuntimeHistory
+from .memory import RSSTracker
+from .memory import TracemallocTracker
+from .resources import ResourceUsage
+from .result import format_count
+from .result import TaskResult
+from .trace import TraceRecorder
+from .tree import TaskTree
+
+import atexit
 import contextlib
+import contextvars
+import functools
 import logging
+import os
 import sys
+import threading
 import time
+import weakref
+
+# TaskLoggers by name, read without locking by `tasklogger.api.get_tasklogger`.
+# Entries are only added or removed under `_registry_lock`.
+_registry = {}
+_registry_lock = threading.RLock()
+# last increment used by `_increment_name` for each base name
+_increments = {}
+# protects the registries of threads of all TaskLoggers, see `_ThreadState`
+_threads_lock = threading.Lock()
 
 
 def _get_logger(name):
@@ -15,12 +40,201 @@ def _tasklogger_exists(logger):
     return hasattr(logger, "tasklogger")
 
 
-def _increment_name(name, increment=1):
-    new_name = "{}_{}".format(name, increment)
-    if not _tasklogger_exists(_get_logger(new_name)):
-        return new_name
-    else:
-        return _increment_name(name, increment=increment + 1)
+def _increment_name(name):
+    """Get the next unused name of the form `{name}_{increment}`
+
+    Starts from the last increment used for `name`, and checks for existing
+    loggers without creating new ones.
+    """
+    increment = _increments.get(name, 0)
+    while True:
+        increment += 1
+        new_name = "{}_{}".format(name, increment)
+        existing = logging.Logger.manager.loggerDict.get(new_name)
+        if not _tasklogger_exists(existing):
+            _increments[name] = increment
+            return new_name
+
+
+_NS_TIMERS = {
+    "perf": time.perf_counter_ns,
+    "monotonic": time.monotonic_ns,
+    "thread": time.thread_time_ns,
+}
+
+
+class TaskHandle(object):
+    """A single running call of a synchronous task
+
+    Returned by `TaskLogger.start_task`. Completing a task by its handle
+    rather than by its name is unambiguous when several calls of the same
+    task are running, e.g. in recursion, and does not search the running
+    tasks.
+
+    Properties
+    ----------
+    task : str
+        Name of the task
+    start : float or int
+        Value of the TaskLogger's timer when the task was started
+    depth : int
+        Number of tasks running in the same thread, including asynchronous
+        tasks of the same context, when the task was started
+    items : int or None
+        Number of items processed by the task, if known. Set before the task
+        completes to report its throughput.
+    nbytes : int or None
+        Number of bytes processed by the task, if known. Set before the task
+        completes to report its throughput.
+    unit : str
+        Name of the items, e.g. "rows"
+    """
+
+    __slots__ = (
+        "task",
+        "start",
+        "depth",
+        "items",
+        "nbytes",
+        "unit",
+        "sample",
+        "message",
+        "node",
+        "child_time",
+        "_stack",
+        "_skipped",
+    )
+
+    def __init__(self, task, depth, stack):
+        self.task = task
+        self.depth = depth
+        self.items = None
+        self.nbytes = None
+        self.unit = "items"
+        # policy that decided not to log this call, if any
+        self.sample = None
+        # start message not yet printed, see `TaskLogger.set_defer_start`
+        self.message = None
+        # path of the task in `TaskLogger.tree`, if any
+        self.node = None
+        # running tasks of the thread that started the task
+        self._stack = stack
+        # (policy, count, runtime) of skipped calls in a deferred `message`
+        self._skipped = None
+
+    def __repr__(self):
+        return "<TaskHandle {!r} at depth {}>".format(self.task, self.depth)
+
+
+class _ThreadState(threading.local):
+    """Tasks running in a single thread
+
+    Parameters
+    ----------
+    threads : `weakref.WeakKeyDictionary`
+        Registry to which the stack of running tasks of each thread is added,
+        keyed by the thread
+    """
+
+    def __init__(self, threads):
+        # running `TaskHandle`s, outermost first
+        self.stack = []
+        with _threads_lock:
+            threads[threading.current_thread()] = self.stack
+        # memory use of running tasks, see `tasklogger.memory`
+        self.memory = []
+        # `TaskHandle`s whose start message is not yet printed
+        self.pending = []
+
+
+class _TaskContext(object):
+    """Context manager used by `TaskLogger.timed`
+
+    Holds no per-call state, so a single instance can be entered
+    repeatedly, recursively and from several threads.
+    """
+
+    __slots__ = ("tasklogger", "task")
+
+    def __init__(self, tasklogger, task):
+        self.tasklogger = tasklogger
+        self.task = task
+
+    def __enter__(self):
+        return self.tasklogger.start_task(self.task)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tasklogger.complete_task(self.task)
+        return False
+
+
+class _DeprecatedAlias(object):
+    """Deprecated method which calls the method `replacement`
+
+    The method is only built, with `deprecated.sphinx.deprecated`, when it is
+    first accessed, so that importing tasklogger does not import `deprecated`
+    and `wrapt`.
+    """
+
+    def __init__(self, replacement):
+        self.replacement = replacement
+        self._method = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def _build(self, owner):
+        from deprecated.sphinx import deprecated
+
+        replacement = self.replacement
+
+        def method(self, *args, **kwargs):
+            return getattr(self, replacement)(*args, **kwargs)
+
+        method.__name__ = self.name
+        method.__qualname__ = "{}.{}".format(owner.__qualname__, self.name)
+        return deprecated(
+            version="1.1.0",
+            reason="Use {}.{} instead".format(owner.__name__, replacement),
+        )(method)
+
+    def __get__(self, instance, owner):
+        if self._method is None:
+            self._method = self._build(owner)
+        return self._method.__get__(instance, owner)
+
+
+class _AsyncTaskContext(object):
+    """Asynchronous context manager returned by `TaskLogger.log_task_async`"""
+
+    __slots__ = ("tasklogger", "task", "_start", "_token")
+
+    def __init__(self, tasklogger, task):
+        self.tasklogger = tasklogger
+        self.task = task
+
+    async def __aenter__(self):
+        tasklogger = self.tasklogger
+        if not tasklogger.aggregate and tasklogger._is_enabled(logging.INFO):
+            tasklogger._log(logging.INFO, "Calculating {}...".format(self.task))
+        async_tasks = tasklogger._async_tasks
+        self._token = async_tasks.set(async_tasks.get() + (self.task,))
+        if tasklogger.trace is not None:
+            tasklogger.trace.begin_async(self.task, id(self))
+        self._start = tasklogger.timer()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        tasklogger = self.tasklogger
+        runtime = tasklogger._elapsed(self._start)
+        if tasklogger.trace is not None:
+            tasklogger.trace.end_async(self.task, id(self))
+        if tasklogger._forward is not None:
+            tasklogger._forward.put(("task", os.getpid(), self.task, runtime))
+        tasklogger._async_tasks.reset(self._token)
+        tasklogger._log_complete(self.task, runtime)
+        if tasklogger.history is not None:
+            tasklogger._check_history(self.task, runtime)
+        return False
 
 
 class TaskLogger(object):
@@ -38,9 +252,14 @@ class TaskLogger(object):
         If False or >= 0, prints WARNING messages.
         If True or >= 1, prints INFO messages.
         If >= 2, prints all messages.
-    timer : {'wall', 'cpu', or callable}, optional (default 'wall')
+    timer : {'wall', 'cpu', 'perf', 'monotonic', 'thread', 'resources', \
+        or callable}, optional (default 'wall')
         Timer function used to measure task running times.
-        'wall' uses `time.time`, 'cpu' uses `time.process_time`
+        'wall' uses `time.time`, 'cpu' uses `time.process_time`,
+        'perf' uses `time.perf_counter_ns`, 'monotonic' uses
+        `time.monotonic_ns` and 'thread' uses `time.thread_time_ns`.
+        'resources' measures wall time, CPU time and resource usage together,
+        see `set_timer`.
     stream: {'stderr', 'stdout', or file-like object posssessing `write()` \
         and `flush()` methods}, optional (default: "stdout")
         File stream to which logs are printed
@@ -55,11 +274,32 @@ class TaskLogger(object):
         attached to the `logging.Logger` attached to the existing
         TaskLogger of the same name. If "increment", creates a new TaskLogger with
         `name` incremented by an integer.
+    aggregate : bool, optional (default: False)
+        If True, no messages are printed when tasks start or complete.
+        Instead, a running summary of runtimes is kept for each task name
+        and printed by `log_summary` or at exit.
+    memory : {None, 'rss', 'tracemalloc'}, optional (default: None)
+        If given, also measure the peak and net memory use of each task.
+        See `set_memory`.
+    defer_start : bool, optional (default: False)
+        If True, only print the start message of a task once it is known to
+        be needed. See `set_defer_start`.
 
     Properties
     ----------
     logger : `logging.Logger`
         Python logging class used to print log messages
+    tasks : dict
+        Start times of the tasks currently running in the calling thread
+    trace : `tasklogger.trace.TraceRecorder` or None
+        Recorder to which task starts and completions are written, if any
+    history : `tasklogger.history.RuntimeHistory` or None
+        Persistent history to which task runtimes are added, if any
+    tree : `tasklogger.tree.TaskTree` or None
+        Runtimes of tasks aggregated by their path of parent tasks, if kept
+    stats : dict
+        Runtime summary (`tasklogger.stats.TaskStats`) of each completed task,
+        kept only if `aggregate` is True
     """
 
     def __init__(
@@ -71,33 +311,54 @@ class TaskLogger(object):
         min_runtime=0.01,
         indent=2,
         if_exists="error",
+        aggregate=False,
+        memory=None,
+        defer_start=False,
         **kwargs,
     ):
-        self.tasks = {}
+        self._reset_threads()
+        self._async_tasks = contextvars.ContextVar("tasklogger_async_tasks", default=())
+        self._stats_lock = threading.Lock()
+        # guards the deferred start messages of `TaskHandle`s
+        self._start_lock = threading.Lock()
+        self._summary_at_exit = False
+        self.stats = {}
+        self.trace = None
+        self.history = None
+        self.tree = None
+        # queue to a `tasklogger.collector.TaskCollector` in another process
+        self._forward = None
+        self._memory = None
+        # (after, growth, stacks), see `set_watchdog`
+        self._watchdog = None
         self.name = name
         self.min_runtime = min_runtime
         self.stream = self._parse_stream(stream)
         self.indent = indent
-        if _tasklogger_exists(self.logger):
-            if if_exists == "error":
-                raise RuntimeError(
-                    "TaskLogger {0} already exists. Please set "
-                    "`name` to be unique or set `if_exists` to "
-                    '"ignore" or "increment"'.format(name)
-                )
-            elif if_exists == "increment":
-                del self._logger
-                self.name = _increment_name(self.name)
-                assert not _tasklogger_exists(self.logger)
-            elif if_exists == "ignore":
-                pass
-            else:
-                raise ValueError(
-                    'Expected `if_exists` in "error", "ignore", "increment".'
-                    " Got {}".format(if_exists)
-                )
-        self.set_level(level)
+        with _registry_lock:
+            if _tasklogger_exists(self.logger):
+                if if_exists == "error":
+                    raise RuntimeError(
+                        "TaskLogger {0} already exists. Please set "
+                        "`name` to be unique or set `if_exists` to "
+                        '"ignore" or "increment"'.format(name)
+                    )
+                elif if_exists == "increment":
+                    del self._logger
+                    self.name = _increment_name(self.name)
+                    assert not _tasklogger_exists(self.logger)
+                elif if_exists == "ignore":
+                    pass
+                else:
+                    raise ValueError(
+                        'Expected `if_exists` in "error", "ignore", "increment".'
+                        " Got {}".format(if_exists)
+                    )
+            self.set_level(level)
         self.set_timer(timer)
+        self.set_aggregate(aggregate)
+        self.set_memory(memory)
+        self.set_defer_start(defer_start)
 
     @staticmethod
     def _parse_stream(stream):
@@ -143,6 +404,37 @@ class TaskLogger(object):
 
         return stream
 
+    def _reset_threads(self):
+        """Forget the tasks running in all threads"""
+        self._threads = weakref.WeakKeyDictionary()
+        self._local = _ThreadState(self._threads)
+
+    def _running(self):
+        """Running tasks of all threads
+
+        Returns
+        -------
+        running : list
+            Pairs of a `threading.Thread` and its stack of `TaskHandle`s
+        """
+        with _threads_lock:
+            return list(self._threads.items())
+
+    @property
+    def tasks(self):
+        """Tasks currently running in the calling thread
+
+        Each thread keeps its own tasks, so that concurrent threads neither
+        overwrite each other's start times nor affect each other's indentation.
+
+        Returns
+        -------
+        tasks : dict
+            Mapping of task name to the time at which it was started. If
+            several calls of a task are running, the innermost one.
+        """
+        return {handle.task: handle.start for handle in self._local.stack}
+
     @property
     def logger(self):
         try:
@@ -199,6 +491,7 @@ class TaskLogger(object):
 
         if not self.logger.handlers:
             self.logger.tasklogger = self
+            _registry[self.name] = self
             self.logger.propagate = False
             handler = logging.StreamHandler(stream=self.stream)
             handler.setFormatter(logging.Formatter(fmt="%(message)s"))
@@ -216,24 +509,338 @@ class TaskLogger(object):
 
         Parameters
         ----------
-        timer : {'wall', 'cpu', or callable}
+        timer : {'wall', 'cpu', 'perf', 'monotonic', 'thread', 'resources', \
+                or callable}
                 Timer function used to measure task running times.
-                'wall' uses `time.time`, 'cpu' uses `time.process_time`
+                'wall' uses `time.time`, 'cpu' uses `time.process_time`,
+                'perf' uses `time.perf_counter_ns`, 'monotonic' uses
+                `time.monotonic_ns` and 'thread' uses `time.thread_time_ns`.
+                The nanosecond timers are monotonic and high resolution;
+                their timestamps are stored as integers and only converted
+                to seconds once a task completes.
+                'resources' uses `tasklogger.resources.ResourceUsage` to
+                measure wall time, CPU time, context switches, block I/O and
+                page faults of the process, which are added to the completion
+                message. `complete_task` then returns a
+                `tasklogger.result.TaskResult`.
 
         Returns
         -------
         self
         """
+        timer_ns = False
         if timer == "wall":
             timer = time.time
         elif timer == "cpu":
             timer = time.process_time
+        elif timer in _NS_TIMERS:
+            timer = _NS_TIMERS[timer]
+            timer_ns = True
+        elif timer == "resources":
+            timer = ResourceUsage
         elif not callable(timer):
             raise ValueError(
-                "Expected timer to be 'wall', 'cpu', or a callable. "
-                "Got {}".format(timer)
+                "Expected timer to be 'wall', 'cpu', 'perf', 'monotonic', "
+                "'thread', 'resources', or a callable. Got {}".format(timer)
             )
         self.timer = timer
+        self._timer_ns = timer_ns
+        return self
+
+    def set_aggregate(self, aggregate=True):
+        """Set whether to aggregate task runtimes rather than print them
+
+        In aggregate mode, starting and completing a task prints nothing.
+        Each completed runtime is added to a fixed-size summary for its task
+        name, which is printed by `log_summary` and once more at exit.
+
+        Parameters
+        ----------
+        aggregate : bool, optional (default: True)
+            If True, aggregate task runtimes
+
+        Returns
+        -------
+        self
+        """
+        self.aggregate = aggregate
+        if aggregate and not self._summary_at_exit:
+            atexit.register(self.log_summary)
+            self._summary_at_exit = True
+        return self
+
+    def set_background_output(
+        self, background=True, maxsize=10000, overflow="block", flush_interval=0.1
+    ):
+        """Set whether messages are written from a background thread
+
+        By default, each message is written and flushed on the calling thread.
+        In background mode, messages are put on a bounded queue instead, and a
+        single writer thread writes them in batches, flushing periodically.
+        Queued messages are written when the TaskLogger's handler is closed,
+        which `logging` does at exit.
+
+        Parameters
+        ----------
+        background : bool, optional (default: True)
+            If True, write messages from a background thread
+        maxsize : int, optional (default: 10000)
+            Maximum number of messages waiting to be written
+        overflow : {"block", "drop-oldest", "count-and-drop"}, \
+            optional (default: "block")
+            Behavior when the queue is full. If "block", wait for the writer
+            to catch up. If "drop-oldest", discard the oldest queued message.
+            If "count-and-drop", discard the new message. The number of
+            dropped messages is written to the stream.
+        flush_interval : float, optional (default: 0.1)
+            Maximum time in seconds between a write and the next flush
+
+        Returns
+        -------
+        self
+        """
+        if background:
+            handler = writer.BackgroundStreamHandler(
+                self.stream,
+                maxsize=maxsize,
+                overflow=overflow,
+                flush_interval=flush_interval,
+            )
+        else:
+            handler = logging.StreamHandler(stream=self.stream)
+        self._set_handler(handler)
+        return self
+
+    def close(self):
+        """Release the TaskLogger
+
+        Logs the summary of aggregated runtimes, if any, then closes the
+        handler and detaches the TaskLogger from its `logging.Logger`, which
+        is removed from the `logging` registry so that it, the handler and the
+        stream can be reclaimed. A TaskLogger of the same name can then be
+        created again.
+
+        Only the TaskLogger which created the `logging.Logger` releases it.
+        TaskLoggers created with `if_exists="ignore"` should be closed
+        before the original.
+        """
+        if self.aggregate:
+            self.log_summary()
+        atexit.unregister(self.log_summary)
+        self.set_memory(None)
+        self.set_watchdog(None)
+        self.set_defer_start(False)
+        self._summary_at_exit = False
+        logger = self.logger
+        with _registry_lock:
+            if getattr(logger, "tasklogger", None) is not self:
+                return
+            if _registry.get(self.name) is self:
+                del _registry[self.name]
+            del logger.tasklogger
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+            # there is no public API to remove a logger from the registry
+            with logging._lock:
+                loggers = logging.Logger.manager.loggerDict
+                if loggers.get(logger.name) is logger:
+                    del loggers[logger.name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _set_handler(self, handler):
+        """Replace the handler to which messages are written"""
+        old_handler = self.logger.handlers[0]
+        handler.setFormatter(old_handler.formatter)
+        self.logger.removeHandler(old_handler)
+        self.logger.addHandler(handler)
+        old_handler.close()
+
+    def set_memory(self, memory=None):
+        """Set whether to measure the memory use of tasks
+
+        The peak and net memory use of each task are added to its completion
+        message, and to the `tasklogger.result.TaskResult` returned by
+        `complete_task`. Nested tasks attribute the peak memory use of their
+        children to their parent. Memory is measured for the whole process,
+        and only for synchronous tasks.
+
+        Parameters
+        ----------
+        memory : {None, 'rss', 'tracemalloc'}, optional (default: None)
+            If 'rss', measure the resident set size of the process, sampled
+            when tasks start and complete. This is cheap, but requires
+            `/proc/self/statm` (Linux).
+            If 'tracemalloc', measure the true peak of memory allocated by
+            Python using `tracemalloc`. This slows down the program and is
+            intended for diagnosis.
+            If None, do not measure memory use.
+
+        Returns
+        -------
+        self
+        """
+        if isinstance(self._memory, TracemallocTracker):
+            self._memory.close()
+        if memory is None:
+            tracker = None
+        elif memory == "rss":
+            tracker = RSSTracker()
+        elif memory == "tracemalloc":
+            tracker = TracemallocTracker()
+        else:
+            raise ValueError(
+                "Expected memory to be None, 'rss' or 'tracemalloc'. "
+                "Got {}".format(memory)
+            )
+        self._memory = tracker
+        return self
+
+    def set_defer_start(self, defer_start=True):
+        """Set whether to defer the start messages of tasks
+
+        By default, "Calculating X..." is printed as soon as a task starts.
+        With deferred start messages, it is held back until another message
+        is printed from the same thread, such as the start message of a
+        nested task, or until it has run for at least `min_runtime` seconds,
+        as seen by the watchdog thread shared by all TaskLoggers (see
+        `tasklogger.watchdog`). Tasks which complete in less than
+        `min_runtime` without printing anything produce no output at all.
+        Only applies to synchronous tasks.
+
+        Parameters
+        ----------
+        defer_start : bool, optional (default: True)
+            If True, defer start messages
+
+        Returns
+        -------
+        self
+        """
+        if defer_start:
+            watchdog.get_watchdog().add(self)
+        elif getattr(self, "defer_start", False) and self._watchdog is None:
+            watchdog.get_watchdog().discard(self)
+        self.defer_start = defer_start
+        return self
+
+    def set_watchdog(self, after=60, growth=2, stacks=False):
+        """Set whether to report tasks which run for a long time
+
+        Tasks running for longer than `after` seconds are reported by a
+        watchdog thread shared by all TaskLoggers, with a message
+        "Still calculating X (elapsed 5m)...", repeated whenever the running
+        time has grown by a factor `growth`. See `tasklogger.watchdog`.
+        Only applies to synchronous tasks.
+
+        Parameters
+        ----------
+        after : float or None, optional (default: 60)
+            Running time in seconds of the first report. If None, stop
+            reporting.
+        growth : float, optional (default: 2)
+            Factor by which the running time grows between reports
+        stacks : bool, optional (default: False)
+            If True, also log the stack of the thread running a reported task
+
+        Returns
+        -------
+        self
+        """
+        if after is None:
+            if self._watchdog is not None:
+                self._watchdog = None
+                if not self.defer_start:
+                    watchdog.get_watchdog().discard(self)
+        else:
+            if growth <= 1:
+                raise ValueError("Expected growth > 1. Got {}".format(growth))
+            self._watchdog = (after, growth, stacks)
+            watchdog.get_watchdog().add(self)
+        return self
+
+    def set_trace(self, trace=None):
+        """Set a recorder for a Chrome Trace Event timeline of tasks
+
+        Every task started from now on is written to the trace, whether or
+        not its messages are printed.
+
+        Parameters
+        ----------
+        trace : str, `tasklogger.trace.TraceRecorder` or None, \
+            optional (default: None)
+            Path of the trace file to write, or a recorder, which may be shared
+            between TaskLoggers. If None, stop recording.
+            The trace is completed by `TraceRecorder.close`, or at exit.
+
+        Returns
+        -------
+        self
+        """
+        if isinstance(trace, str):
+            trace = TraceRecorder(trace)
+        self.trace = trace
+        return self
+
+    def set_history(self, history=None):
+        """Set a persistent history of runtimes to detect regressions
+
+        The runtime of every task completed from now on is added to the
+        history, and a warning is logged if it is much slower than the
+        previous runtimes of the task, in this or previous runs. Tasks which
+        complete in less than `min_runtime` are never reported.
+
+        Parameters
+        ----------
+        history : str, `tasklogger.history.RuntimeHistory` or None, \
+            optional (default: None)
+            Path of the SQLite database in which to keep the history, or a
+            history, which may be shared between TaskLoggers. If None, stop
+            adding runtimes.
+
+        Returns
+        -------
+        self
+        """
+        if isinstance(history, str):
+            history = RuntimeHistory(history)
+        self.history = history
+        return self
+
+    def set_tree(self, tree=True):
+        """Set whether to aggregate runtimes by path of parent tasks
+
+        The runtime of each synchronous task started from now on is added to
+        the total time of its path of parent tasks, e.g. "load;parse",
+        and its runtime minus that of its children to the self time of the
+        path. The tree can be written for flame graph tools with
+        `TaskTree.write_collapsed`.
+
+        Parameters
+        ----------
+        tree : bool, str or `tasklogger.tree.TaskTree`, optional (default: True)
+            If True, keep a new tree. If a path, keep a new tree and write it
+            to that file in collapsed stack format at exit. If a tree, which
+            may be shared between TaskLoggers, add to it. If False or None,
+            stop adding runtimes.
+
+        Returns
+        -------
+        self
+        """
+        if tree is True:
+            tree = TaskTree()
+        elif isinstance(tree, str):
+            tree = TaskTree(tree)
+        elif tree is False:
+            tree = None
+        self.tree = tree
         return self
 
     def set_indent(self, indent=2):
@@ -252,15 +859,50 @@ class TaskLogger(object):
         self.indent = indent
         return self
 
-    def _log(self, log_fn, msg):
-        """Log a message"""
+    def _is_enabled(self, level):
+        """Check if messages at `level` will be emitted
+
+        `logging.Logger.isEnabledFor` caches its answer until the level of any
+        logger changes, including through another TaskLogger of the same name.
+        """
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level, msg, depth=None):
+        """Log a message
+
+        Indented by the number of tasks running in the calling thread,
+        or by `depth` if given
+        """
+        if not self._is_enabled(level):
+            return
+        if self.defer_start:
+            pending = self._local.pending
+            if pending:
+                for handle in pending:
+                    self._write_start(handle)
+                pending.clear()
+        if depth is None and self.indent > 0:
+            depth = len(self._local.stack) + len(self._async_tasks.get())
+        self._write(level, msg, depth)
+
+    def _write_start(self, handle):
+        """Log the deferred start message of a task, unless already logged
+
+        Called both by the thread running the task and by the watchdog
+        """
+        with self._start_lock:
+            message = handle.message
+            if message is not None:
+                handle.message = None
+                self._write(logging.INFO, message, handle.depth)
+
+    def _write(self, level, msg, depth):
+        """Log an indented message"""
         if self.indent > 0:
-            msg = len(self.tasks) * self.indent * " " + msg
-        return log_fn(msg)
+            msg = depth * self.indent * " " + msg
+        self.logger.log(level, msg)
 
-    @deprecated(version="1.1.0", reason="Use TaskLogger.log_debug instead")
-    def debug(self, msg):
-        return self.log_debug(msg)
+    debug = _DeprecatedAlias("log_debug")
 
     def log_debug(self, msg):
         """Log a DEBUG message
@@ -272,11 +914,9 @@ class TaskLogger(object):
         msg : str
             Message to be logged
         """
-        self._log(self.logger.debug, msg)
+        self._log(logging.DEBUG, msg)
 
-    @deprecated(version="1.1.0", reason="Use TaskLogger.log_info instead")
-    def info(self, msg):
-        return self.log_info(msg)
+    info = _DeprecatedAlias("log_info")
 
     def log_info(self, msg):
         """Log an INFO message
@@ -288,11 +928,9 @@ class TaskLogger(object):
         msg : str
             Message to be logged
         """
-        self._log(self.logger.info, msg)
+        self._log(logging.INFO, msg)
 
-    @deprecated(version="1.1.0", reason="Use TaskLogger.log_warning instead")
-    def warning(self, msg):
-        return self.log_warning(msg)
+    warning = _DeprecatedAlias("log_warning")
 
     def log_warning(self, msg):
         """Log a WARNING message
@@ -304,11 +942,9 @@ class TaskLogger(object):
         msg : str
             Message to be logged
         """
-        self._log(self.logger.warning, msg)
+        self._log(logging.WARNING, msg)
 
-    @deprecated(version="1.1.0", reason="Use TaskLogger.log_error instead")
-    def error(self, msg):
-        return self.log_error(msg)
+    error = _DeprecatedAlias("log_error")
 
     def log_error(self, msg):
         """Log an ERROR message
@@ -320,11 +956,9 @@ class TaskLogger(object):
         msg : str
             Message to be logged
         """
-        self._log(self.logger.error, msg)
+        self._log(logging.ERROR, msg)
 
-    @deprecated(version="1.1.0", reason="Use TaskLogger.log_critical instead")
-    def critical(self, msg):
-        return self.log_critical(msg)
+    critical = _DeprecatedAlias("log_critical")
 
     def log_critical(self, msg):
         """Log a CRITICAL message
@@ -336,9 +970,9 @@ class TaskLogger(object):
         msg : str
             Message to be logged
         """
-        self._log(self.logger.critical, msg)
+        self._log(logging.CRITICAL, msg)
 
-    def start_task(self, task):
+    def start_task(self, task, sample=None):
         """Begin logging of a task
 
         Stores the time this task was started in order to return
@@ -348,9 +982,47 @@ class TaskLogger(object):
         ----------
         task : str
             Name of the task to be started
+        sample : `tasklogger.sampling.SamplingPolicy`, optional (default: None)
+            Policy deciding whether this call is logged, e.g.
+            `tasklogger.sampling.EveryN(100)`. Calls which are not sampled are
+            still timed, and are reported on the next logged start of `task`.
+
+        Returns
+        -------
+        handle : `TaskHandle`
+            The running task, which can be passed to `complete_task`
         """
-        self.log_info("Calculating {}...".format(task))
-        self.tasks[task] = self.timer()
+        local = self._local
+        stack = local.stack
+        handle = TaskHandle(task, len(stack) + len(self._async_tasks.get()), stack)
+        if not self.aggregate:
+            if sample is not None and not sample.sample(task):
+                handle.sample = sample
+            elif self._is_enabled(logging.INFO):
+                msg = "Calculating {}...".format(task)
+                if sample is not None:
+                    skipped, runtime = sample.pop_skipped(task)
+                    if skipped:
+                        msg += " (skipped {} calls in {:.2f} seconds)".format(
+                            skipped, runtime
+                        )
+                if self.defer_start:
+                    handle.message = msg
+                    if sample is not None:
+                        handle._skipped = (sample, skipped, runtime)
+                    local.pending.append(handle)
+                else:
+                    self._log(logging.INFO, msg)
+        if self.trace is not None:
+            self.trace.begin(task)
+        if self._memory is not None:
+            self._memory.start(local.memory, handle)
+        if self.tree is not None:
+            handle.node = self.tree.child(stack[-1].node if stack else None, task)
+            handle.child_time = 0
+        stack.append(handle)
+        handle.start = self.timer()
+        return handle
 
     def complete_task(self, task):
         """Complete logging of a task
@@ -359,37 +1031,275 @@ class TaskLogger(object):
 
         Parameters
         ----------
-        task : str
-            Name of the task to be started
+        task : str or `TaskHandle`
+            Name of the task to be completed, or the handle returned by
+            `start_task`. If a name is given and several calls of the task are
+            running in the calling thread, the innermost one is completed.
 
         Returns
         -------
-        time : float
-            The time lapsed between task start and completion
+        time : float or `tasklogger.result.TaskResult`
+            The time lapsed between task start and completion. If memory use
+            is measured or the timer is 'resources', a `TaskResult` which also
+            holds these measurements.
+
+        Raises
+        ------
+        ValueError : `task` is a `TaskHandle` which was already completed, or
+            which was started in another thread
         """
-        try:
-            runtime = self.timer() - self.tasks[task]
-            del self.tasks[task]
-            if runtime >= self.min_runtime:
-                self.log_info("Calculated {} in {:.2f} seconds.".format(task, runtime))
-            return runtime
-        except KeyError:
-            self.log_info("Calculated {}.".format(task))
-
-    @deprecated(version="1.1.0", reason="Use TaskLogger.log_task instead")
-    def task(self, task):
-        return self.log_task(task)
+        local = self._local
+        if isinstance(task, TaskHandle):
+            handle = task
+            task = handle.task
+            stack = handle._stack
+            if stack is not local.stack:
+                raise ValueError(
+                    "Task {} was started in another thread. Tasks must be "
+                    "completed in the thread which started them".format(task)
+                )
+            if stack and stack[-1] is handle:
+                stack.pop()
+            else:
+                for i in range(len(stack) - 1, -1, -1):
+                    if stack[i] is handle:
+                        del stack[i]
+                        break
+                else:
+                    raise ValueError("Task {} was already completed".format(task))
+        else:
+            stack = local.stack
+            if stack and stack[-1].task == task:
+                handle = stack.pop()
+            else:
+                for i in range(len(stack) - 2, -1, -1):
+                    if stack[i].task == task:
+                        handle = stack.pop(i)
+                        break
+                else:
+                    self.log_info("Calculated {}.".format(task))
+                    return
+        runtime = self._elapsed(handle.start)
+        node = handle.node
+        if node is not None and self.tree is not None:
+            self.tree.add(node, runtime, handle.child_time)
+            if stack and stack[-1].node is node.parent:
+                stack[-1].child_time += runtime
+        if self._memory is not None:
+            peak, net = self._memory.stop(local.memory, handle)
+            if peak is not None:
+                if not isinstance(runtime, TaskResult):
+                    runtime = TaskResult(runtime)
+                runtime.memory_peak = peak
+                runtime.memory_net = net
+        if handle.items is not None or handle.nbytes is not None:
+            if not isinstance(runtime, TaskResult):
+                runtime = TaskResult(runtime)
+            if handle.items is not None:
+                runtime.items = handle.items
+                runtime.unit = handle.unit
+            if handle.nbytes is not None:
+                runtime.nbytes = handle.nbytes
+        if self.trace is not None:
+            self.trace.end(task)
+        if self._forward is not None:
+            self._forward.put(("task", os.getpid(), task, runtime))
+        if handle.message is not None and (
+            runtime < self.min_runtime or not self._is_enabled(logging.INFO)
+        ):
+            # the completion message will not be printed, so neither is the
+            # start message
+            with self._start_lock:
+                discarded = handle.message is not None
+                handle.message = None
+            pending = local.pending
+            if pending and pending[-1] is handle:
+                pending.pop()
+            elif handle in pending:
+                pending.remove(handle)
+            if discarded and handle._skipped is not None:
+                # nothing was printed: return the skipped calls to the policy,
+                # and count this call as skipped too
+                sample, skipped, skipped_runtime = handle._skipped
+                if skipped:
+                    sample.skip(task, skipped_runtime, skipped)
+                handle.sample = sample
+        if handle.sample is not None:
+            handle.sample.skip(task, runtime)
+        else:
+            self._log_complete(task, runtime)
+        if self.history is not None:
+            self._check_history(task, runtime)
+        return runtime
+
+    def _elapsed(self, start):
+        """Time lapsed since `start`, in seconds for the built-in timers"""
+        runtime = self.timer() - start
+        if self._timer_ns:
+            runtime = runtime / 1e9
+        return runtime
+
+    def _record(self, task, runtime):
+        """Add a runtime to the summary of `task`"""
+        with self._stats_lock:
+            try:
+                self.stats[task].add(runtime)
+            except KeyError:
+                task_stats = self.stats[task] = stats.TaskStats()
+                task_stats.add(runtime)
+
+    def _log_complete(self, task, runtime):
+        """Log the completion message of a task"""
+        if self.aggregate:
+            self._record(task, runtime)
+        elif runtime >= self.min_runtime and self._is_enabled(logging.INFO):
+            msg = "Calculated {} in {:.2f} seconds".format(task, runtime)
+            if isinstance(runtime, TaskResult):
+                description = runtime.describe()
+                if description:
+                    msg += " ({})".format(description)
+            self._log(logging.INFO, msg + ".")
+
+    def _check_history(self, task, runtime):
+        """Add a runtime to the history, and warn if it is a regression
+
+        Tasks faster than `min_runtime` are recorded without warning, as their
+        runtimes are dominated by jitter.
+        """
+        regression = self.history.add(task, runtime)
+        if regression is not None and runtime >= self.min_runtime:
+            count, mean, std = regression
+            self.log_warning(
+                "{} took {:.2f} seconds, slower than its mean of {:.2f} "
+                "+/- {:.2f} seconds over the last {} runs.".format(
+                    task, runtime, mean, std, count
+                )
+            )
+
+    def log_summary(self, reset=False):
+        """Log a summary table of aggregated task runtimes
+
+        Prints, for each task name, the number of calls and the total, mean,
+        minimum, median, 95th percentile, 99th percentile and maximum runtime.
+
+        Parameters
+        ----------
+        reset : bool, optional (default: False)
+            If True, clear the summaries once printed
+        """
+        with self._stats_lock:
+            task_stats = list(self.stats.items())
+            if reset:
+                self.stats = {}
+        if not task_stats or not self._is_enabled(logging.INFO):
+            return
+        width = max(len("Task"), max(len(str(task)) for task, _ in task_stats))
+        columns = ["count", "total", "mean", "min", "p50", "p95", "p99", "max"]
+        row = "{:<{width}}" + " {:>9}" * len(columns)
+        self._log(logging.INFO, row.format("Task", *columns, width=width))
+        for task, summary in task_stats:
+            values = [
+                summary.total,
+                summary.mean,
+                summary.min,
+                summary.quantile(0.5),
+                summary.quantile(0.95),
+                summary.quantile(0.99),
+                summary.max,
+            ]
+            self._log(
+                logging.INFO,
+                row.format(
+                    str(task),
+                    summary.count,
+                    *["{:.3g}".format(value) for value in values],
+                    width=width,
+                ),
+            )
+
+    def log_tree(self, sort="self"):
+        """Log a profile of the tasks aggregated by `set_tree`
+
+        Prints, for each path of tasks, the number of calls, the total time,
+        the self time excluding child tasks, the time in child tasks, the
+        percentage of the total time of the parent task (or of all tasks,
+        for tasks without parent) and whether the path is on the critical
+        path, i.e. the chain of tasks with the largest total time at each
+        level, which is also printed.
+
+        Parameters
+        ----------
+        sort : {"self", "total", "count"}, optional (default: "self")
+            Column by which the table is sorted, largest first
+        """
+        if sort not in ["self", "total", "count"]:
+            raise ValueError(
+                "Expected sort in 'self', 'total', 'count'. Got {}".format(sort)
+            )
+        if self.tree is None or not self._is_enabled(logging.INFO):
+            return
+        nodes = list(self.tree.nodes())
+        if not nodes:
+            return
+        critical = self.tree.critical_path()
+        root_total = sum(node.total for node in nodes if node.parent.parent is None)
+        key = {
+            "self": lambda node: node.self_time,
+            "total": lambda node: node.total,
+            "count": lambda node: node.count,
+        }[sort]
+        nodes.sort(key=key, reverse=True)
+        paths = [";".join(str(task) for task in node.path) for node in nodes]
+        width = max(len("Task"), max(len(path) for path in paths))
+        columns = ["count", "total", "self", "children", "% parent", "critical"]
+        row = "{:<{width}}" + " {:>9}" * len(columns)
+        self._log(logging.INFO, row.format("Task", *columns, width=width))
+        for node, path in zip(nodes, paths):
+            parent_total = (
+                root_total if node.parent.parent is None else node.parent.total
+            )
+            self._log(
+                logging.INFO,
+                row.format(
+                    path,
+                    node.count,
+                    "{:.3g}".format(node.total),
+                    "{:.3g}".format(node.self_time),
+                    "{:.3g}".format(node.total - node.self_time),
+                    "{:.1%}".format(node.total / parent_total) if parent_total else "",
+                    "*" if node in critical else "",
+                    width=width,
+                ),
+            )
+        self._log(
+            logging.INFO,
+            "Critical path: {}".format(";".join(str(node.task) for node in critical)),
+        )
+
+    task = _DeprecatedAlias("log_task")
 
     @contextlib.contextmanager
-    def log_task(self, task):
+    def log_task(self, task, sample=None, items=None, nbytes=None, unit="items"):
         """Context manager for logging a task
 
-        Times the action within the context frame
+        Times the action within the context frame. Yields the `TaskHandle`
+        of the task, whose `items` and `nbytes` can be set within the context
+        frame if they are not known in advance.
 
         Parameters
         ----------
         task : str
             Name of the task to be started
+        sample : `tasklogger.sampling.SamplingPolicy`, optional (default: None)
+            Policy deciding whether this call is logged
+        items : int, optional (default: None)
+            Number of items processed by the task. If given, the completion
+            message reports the number of items per second.
+        nbytes : int, optional (default: None)
+            Number of bytes processed by the task. If given, the completion
+            message reports the number of bytes per second.
+        unit : str, optional (default: "items")
+            Name of the items
 
         Examples
         --------
@@ -400,8 +1310,165 @@ class TaskLogger(object):
         ...     time.sleep(1)
         Calculating test...
         Calculated test in 1.00 seconds.
+        >>> with logger.log_task('decode', unit='rows') as decode:
+        ...     rows = decode_file(path)
+        ...     decode.items = len(rows)
+        ...     decode.nbytes = os.path.getsize(path)
+        Calculating decode...
+        Calculated decode in 2.10 seconds (4.7M rows/s, 310.0 MB/s).
         """
+        handle = self.start_task(task, sample=sample)
+        handle.items = items
+        handle.nbytes = nbytes
+        handle.unit = unit
         try:
-            yield self.start_task(task)
+            yield handle
         finally:
-            self.complete_task(task)
+            self.complete_task(handle)
+
+    def log_iter(self, iterable, task, total=None, interval=10, unit="items"):
+        """Log the progress of a task which iterates over `iterable`
+
+        Yields the items of `iterable` unchanged, timing the iteration as a
+        task. Every `interval` seconds, logs the number of items processed
+        so far, the throughput and, if the total number of items is known,
+        the estimated time remaining. The completion message also reports
+        the throughput.
+
+        Parameters
+        ----------
+        iterable : iterable
+            Items to iterate over
+        task : str
+            Name of the task
+        total : int, optional (default: None)
+            Total number of items. Defaults to `len(iterable)`, if defined.
+        interval : float, optional (default: 10)
+            Time in seconds between progress messages
+        unit : str, optional (default: "items")
+            Name of the items
+
+        Examples
+        --------
+        >>> import tasklogger
+        >>> import time
+        >>> logger = tasklogger.TaskLogger()
+        >>> for i in logger.log_iter(range(40), 'test'):
+        ...     time.sleep(0.5)
+        Calculating test...
+          Calculating test: 20/40 items (50%), 2 items/s, 10 seconds left
+        Calculated test in 20.00 seconds (2 items/s).
+        """
+        if total is None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                pass
+        handle = self.start_task(task)
+        handle.unit = unit
+        count = 0
+        clock = time.monotonic
+        start = clock()
+        next_progress = start + interval
+        try:
+            for item in iterable:
+                yield item
+                count += 1
+                if clock() >= next_progress:
+                    now = clock()
+                    next_progress = now + interval
+                    self._log_progress(task, count, total, unit, now - start)
+        finally:
+            handle.items = count
+            self.complete_task(handle)
+
+    def _log_progress(self, task, count, total, unit, elapsed):
+        """Log the progress message of `log_iter`"""
+        if self.aggregate or not self._is_enabled(logging.INFO):
+            return
+        rate = count / elapsed
+        if total is None:
+            msg = "Calculating {}: {} {}".format(task, count, unit)
+        else:
+            msg = "Calculating {}: {}/{} {} ({:.0%})".format(
+                task, count, total, unit, count / total
+            )
+        msg += ", {} {}/s".format(format_count(rate), unit)
+        if total is not None and count < total:
+            msg += ", {:.0f} seconds left".format((total - count) / rate)
+        self._log(logging.INFO, msg)
+
+    def log_task_async(self, task):
+        """Asynchronous context manager for logging a task
+
+        Times the action within the context frame. Running tasks are stored
+        in a `contextvars.ContextVar` rather than per thread, so that
+        each `asyncio.Task` keeps its own, correctly nested timings even
+        when many coroutines are interleaved in the same thread.
+
+        Parameters
+        ----------
+        task : str
+            Name of the task to be started
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> import tasklogger
+        >>> logger = tasklogger.TaskLogger()
+        >>> async def main():
+        ...     async with logger.log_task_async('test'):
+        ...         await asyncio.sleep(1)
+        >>> asyncio.run(main())
+        Calculating test...
+        Calculated test in 1.00 seconds.
+        """
+        return _AsyncTaskContext(self, task)
+
+    def timed(self, func=None, name=None):
+        """Decorator for logging each call of a function as a task
+
+        Works on functions, methods and coroutine functions. Coroutine
+        functions are timed as with `log_task_async`.
+
+        Parameters
+        ----------
+        func : callable, optional
+            Function to be timed. If not given, returns a decorator.
+        name : str, optional (default: None)
+            Name of the task. Defaults to the function's qualified name.
+
+        Examples
+        --------
+        >>> import tasklogger
+        >>> import time
+        >>> logger = tasklogger.TaskLogger()
+        >>> @logger.timed
+        ... def test():
+        ...     time.sleep(1)
+        >>> test()
+        Calculating test...
+        Calculated test in 1.00 seconds.
+        """
+        if func is None:
+            return functools.partial(self.timed, name=name)
+        if name is None:
+            name = func.__qualname__
+        import inspect
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed_func(*args, **kwargs):
+                async with _AsyncTaskContext(self, name):
+                    return await func(*args, **kwargs)
+
+        else:
+            context = _TaskContext(self, name)
+
+            @functools.wraps(func)
+            def timed_func(*args, **kwargs):
+                with context:
+                    return func(*args, **kwargs)
+
+        return timed_func
@@ -0,0 +1,152 @@
+import os
+import threading
+
+
+class _MemoryTracker(object):
+    """Measure the peak and net memory use of nested tasks
+
+    Each thread keeps a stack of frames `[task, start, peak]` for its running
+    tasks. The peak memory observed while a child task runs is passed up to
+    its parent when the child completes, so that each task is attributed the
+    peak of all its children.
+
+    Memory use is measured for the whole process. Before the peak is reset,
+    it is written to the innermost frame of every thread with running tasks,
+    so that a task starting or completing in one thread does not lose the
+    peak of tasks running in other threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # stacks of frames with running tasks, keyed by their id
+        self._threads = {}
+
+    def _read(self):
+        """Read the current memory use and the peak since `_reset_peak`"""
+        raise NotImplementedError
+
+    def _reset_peak(self):
+        pass
+
+    def _update_peaks(self, peak):
+        """Pass the peak to the innermost frame of every thread"""
+        for frames in self._threads.values():
+            if peak > frames[-1][2]:
+                frames[-1][2] = peak
+
+    def start(self, frames, task):
+        """Begin tracking the memory use of a task
+
+        Parameters
+        ----------
+        frames : list
+            Running tasks of the calling thread
+        task : `tasklogger.logger.TaskHandle`
+            The running task
+        """
+        with self._lock:
+            current, peak = self._read()
+            self._update_peaks(peak)
+            self._reset_peak()
+            frames.append([task, current, current])
+            self._threads[id(frames)] = frames
+
+    def stop(self, frames, task):
+        """Complete tracking the memory use of a task
+
+        Parameters
+        ----------
+        frames : list
+            Running tasks of the calling thread
+        task : `tasklogger.logger.TaskHandle`
+            The running task
+
+        Returns
+        -------
+        peak : int or None
+            Peak memory use in bytes above that at the start of the task,
+            or None if the task is not being tracked
+        net : int or None
+            Change in memory use in bytes since the start of the task
+        """
+        with self._lock:
+            current, peak = self._read()
+            self._update_peaks(peak)
+            self._reset_peak()
+            for i in range(len(frames) - 1, -1, -1):
+                if frames[i][0] is task:
+                    break
+            else:
+                return None, None
+            _, start, frame_peak = frames.pop(i)
+            frame_peak = max(frame_peak, peak, current)
+            if i > 0 and frame_peak > frames[i - 1][2]:
+                frames[i - 1][2] = frame_peak
+            if not frames:
+                del self._threads[id(frames)]
+        return frame_peak - start, current - start
+
+
+class RSSTracker(_MemoryTracker):
+    """Track the resident set size of the process
+
+    Reads `/proc/self/statm`, which is cheap enough to leave enabled in
+    production. The peak is the largest resident set size observed when
+    a task or any of its children starts or completes.
+    """
+
+    _statm = "/proc/self/statm"
+
+    def __init__(self):
+        super().__init__()
+        if not os.path.exists(self._statm):
+            raise RuntimeError(
+                "RSS memory tracking requires {}. "
+                "Use 'tracemalloc' instead.".format(self._statm)
+            )
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def _read(self):
+        with open(self._statm, "rb") as handle:
+            rss = int(handle.read().split()[1]) * self._page_size
+        return rss, rss
+
+
+class TracemallocTracker(_MemoryTracker):
+    """Track memory allocated by Python with `tracemalloc`
+
+    Starts `tracemalloc` if it is not already tracing, which slows down
+    allocations considerably; intended for diagnosis. The peak is the true
+    peak of traced memory during each task.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # tracemalloc is only imported when used
+        import tracemalloc
+
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+
+    def _read(self):
+        import tracemalloc
+
+        return tracemalloc.get_traced_memory()
+
+    def _reset_peak(self):
+        import tracemalloc
+
+        try:
+            tracemalloc.reset_peak()
+        except AttributeError:
+            # Python < 3.9: the peak is that since tracing started
+            pass
+
+    def close(self):
+        """Stop `tracemalloc` if it was started by this tracker"""
+        if self.started:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self.started = False
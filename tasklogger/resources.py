@@ -0,0 +1,57 @@
+from .result import TaskResult
+
+import math
+import time
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+# `resource.struct_rusage` fields reported by `ResourceUsage`
+RUSAGE_FIELDS = {
+    "voluntary_switches": "ru_nvcsw",
+    "involuntary_switches": "ru_nivcsw",
+    "block_input": "ru_inblock",
+    "block_output": "ru_oublock",
+    "minor_faults": "ru_minflt",
+    "major_faults": "ru_majflt",
+}
+
+
+class ResourceUsage(object):
+    """Snapshot of the wall time and resource usage of the process
+
+    Used as the timer of a TaskLogger with `set_timer('resources')`.
+    Subtracting two snapshots gives a `tasklogger.result.TaskResult`
+    holding the wall time in seconds, with the CPU time, the ratio of CPU to
+    wall time and, where `resource.getrusage` is available, the number of
+    context switches, block I/O operations and page faults in between.
+    """
+
+    __slots__ = ("wall", "cpu", "rusage")
+
+    def __init__(self):
+        self.wall = time.perf_counter_ns()
+        if resource is not None:
+            self.rusage = resource.getrusage(resource.RUSAGE_SELF)
+            self.cpu = self.rusage.ru_utime + self.rusage.ru_stime
+        else:
+            self.rusage = None
+            self.cpu = time.process_time()
+
+    def __sub__(self, start):
+        wall_time = (self.wall - start.wall) / 1e9
+        result = TaskResult(wall_time)
+        result.wall_time = wall_time
+        result.cpu_time = self.cpu - start.cpu
+        result.cpu_ratio = result.cpu_time / wall_time if wall_time > 0 else math.nan
+        if self.rusage is not None:
+            for name, field in RUSAGE_FIELDS.items():
+                setattr(
+                    result,
+                    name,
+                    getattr(self.rusage, field) - getattr(start.rusage, field),
+                )
+        return result
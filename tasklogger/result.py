@@ -0,0 +1,131 @@
+class TaskResult(float):
+    """Runtime of a completed task, with additional measurements
+
+    Behaves as the runtime in seconds, as returned by
+    `TaskLogger.complete_task`. Additional measurements taken for the task
+    are available as attributes.
+
+    Properties
+    ----------
+    memory_peak : int
+        Peak memory use during the task, in bytes above the memory in use
+        when it started. Only set if memory tracking is enabled.
+    memory_net : int
+        Change in memory use between the start and completion of the task,
+        in bytes. Only set if memory tracking is enabled.
+    wall_time : float
+        Wall time in seconds. Only set with the 'resources' timer, as are
+        all following properties.
+    cpu_time : float
+        CPU time of the process in seconds
+    cpu_ratio : float
+        Ratio of CPU time to wall time. Close to 1 for a CPU-bound task,
+        close to 0 for a task waiting on I/O, and above 1 if several threads
+        are running.
+    voluntary_switches : int
+        Context switches due to waiting for a resource, such as I/O
+    involuntary_switches : int
+        Context switches due to being preempted, e.g. by other processes
+    block_input : int
+        Block input operations
+    block_output : int
+        Block output operations
+    minor_faults : int
+        Page faults serviced without I/O
+    major_faults : int
+        Page faults requiring I/O
+    items : int
+        Number of items processed. Only set for tasks which report it, such
+        as `TaskLogger.log_iter`.
+    unit : str
+        Name of the items. Only set with `items`.
+    nbytes : int
+        Number of bytes processed. Only set for tasks which report it.
+    """
+
+    def describe(self):
+        """Describe the additional measurements
+
+        Returns
+        -------
+        description : str
+            Measurements in a human-readable form, or an empty string
+        """
+        measurements = []
+        if hasattr(self, "cpu_time"):
+            measurements.append(
+                "CPU {:.2f} seconds, {:.0%} of wall time".format(
+                    self.cpu_time, self.cpu_ratio
+                )
+            )
+        if hasattr(self, "voluntary_switches"):
+            measurements.append(
+                "{} voluntary / {} involuntary context switches, "
+                "{} / {} blocks in / out, {} major page faults".format(
+                    self.voluntary_switches,
+                    self.involuntary_switches,
+                    self.block_input,
+                    self.block_output,
+                    self.major_faults,
+                )
+            )
+        if hasattr(self, "memory_peak"):
+            measurements.append(
+                "peak {}, net {}".format(
+                    format_bytes(self.memory_peak, sign=True),
+                    format_bytes(self.memory_net, sign=True),
+                )
+            )
+        if self > 0:
+            if hasattr(self, "items"):
+                measurements.append(
+                    "{} {}/s".format(format_count(self.items / self), self.unit)
+                )
+            if hasattr(self, "nbytes"):
+                measurements.append("{}/s".format(format_bytes(self.nbytes / self)))
+        return ", ".join(measurements)
+
+
+def format_bytes(nbytes, sign=False):
+    """Format a number of bytes with a decimal unit prefix
+
+    Parameters
+    ----------
+    nbytes : int
+        Number of bytes
+    sign : bool, optional (default: False)
+        If True, always show the sign
+
+    Returns
+    -------
+    formatted : str
+        e.g. "12.3 MB"
+    """
+    value = float(nbytes)
+    for unit in ["B", "kB", "MB", "GB", "TB"]:
+        if abs(value) < 1000 or unit == "TB":
+            break
+        value /= 1000
+    return "{}{:.1f} {}".format("+" if sign and value >= 0 else "", value, unit)
+
+
+def format_count(count):
+    """Format a number with a decimal unit prefix
+
+    Parameters
+    ----------
+    count : float
+        Number to format
+
+    Returns
+    -------
+    formatted : str
+        e.g. "4.7M", to three significant figures
+    """
+    value = float(count)
+    for prefix in ["", "k", "M", "G", "T"]:
+        # values which round up to 1000 use the next prefix
+        if abs(value) < 999.5 or prefix == "T":
+            break
+        value /= 1000
+    return "{:.3g}{}".format(value, prefix)
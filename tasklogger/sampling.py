@@ -0,0 +1,168 @@
+import threading
+import time
+
+
+class SamplingPolicy(object):
+    """Base class for deciding which calls of a repeated task are logged
+
+    Calls which are not sampled are still timed by the `TaskLogger`, but
+    print nothing. The number of skipped calls and their total runtime is
+    reported on the next line logged for the same task name.
+
+    Subclasses implement `_sample`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+        self._skipped = {}
+
+    def _sample(self, task, state):
+        """Decide whether to log a call of `task`
+
+        Parameters
+        ----------
+        task : str
+            Name of the task being started
+        state : list
+            Mutable per-task state, empty on the first call of `task`
+
+        Returns
+        -------
+        sample : bool
+            If True, the call is logged
+        """
+        raise NotImplementedError
+
+    def sample(self, task):
+        """Decide whether to log a call of `task`
+
+        Parameters
+        ----------
+        task : str
+            Name of the task being started
+
+        Returns
+        -------
+        sample : bool
+            If True, the call is logged
+        """
+        with self._lock:
+            try:
+                state = self._state[task]
+            except KeyError:
+                state = self._state[task] = []
+            return self._sample(task, state)
+
+    def skip(self, task, runtime, count=1):
+        """Record a completed call of `task` that was not logged
+
+        Parameters
+        ----------
+        task : str
+            Name of the completed task
+        runtime : float
+            The time lapsed between task start and completion
+        count : int, optional (default: 1)
+            Number of calls, if `runtime` is their total runtime
+        """
+        with self._lock:
+            try:
+                skipped = self._skipped[task]
+                skipped[0] += count
+                skipped[1] += runtime
+            except KeyError:
+                self._skipped[task] = [count, runtime]
+
+    def pop_skipped(self, task):
+        """Retrieve and reset the calls of `task` skipped since it was last logged
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+
+        Returns
+        -------
+        count : int
+            Number of skipped calls
+        runtime : float
+            Total runtime of the skipped calls
+        """
+        with self._lock:
+            return tuple(self._skipped.pop(task, (0, 0)))
+
+
+class EveryN(SamplingPolicy):
+    """Log one in every `n` calls of a task
+
+    Parameters
+    ----------
+    n : int
+        Sampling period. The first call is always logged.
+    """
+
+    def __init__(self, n):
+        super().__init__()
+        if n < 1:
+            raise ValueError("Expected n >= 1. Got {}".format(n))
+        self.n = n
+
+    def _sample(self, task, state):
+        if not state:
+            state.append(0)
+        count = state[0]
+        state[0] = count + 1
+        return count % self.n == 0
+
+
+class Interval(SamplingPolicy):
+    """Log at most one call of a task every `seconds`
+
+    Parameters
+    ----------
+    seconds : float
+        Minimum wall time between two logged calls of the same task
+    """
+
+    def __init__(self, seconds):
+        super().__init__()
+        self.seconds = seconds
+
+    def _sample(self, task, state):
+        now = time.monotonic()
+        if state and now - state[0] < self.seconds:
+            return False
+        state[:] = [now]
+        return True
+
+
+class TokenBucket(SamplingPolicy):
+    """Log calls of a task while tokens remain in its bucket
+
+    Each logged call consumes a token. Tokens are refilled at `rate`
+    per second, up to `burst`.
+
+    Parameters
+    ----------
+    rate : float
+        Number of tokens added per second
+    burst : int, optional (default: 1)
+        Maximum number of tokens in the bucket
+    """
+
+    def __init__(self, rate, burst=1):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+
+    def _sample(self, task, state):
+        now = time.monotonic()
+        if not state:
+            state[:] = [self.burst, now]
+        tokens = min(self.burst, state[0] + (now - state[1]) * self.rate)
+        if tokens >= 1:
+            state[:] = [tokens - 1, now]
+            return True
+        state[:] = [tokens, now]
+        return False
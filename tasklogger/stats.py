@@ -0,0 +1,108 @@
+import math
+
+# runtimes below this are counted in a single bucket rather than
+# a log-spaced bucket of their own
+_MIN_RUNTIME = 1e-9
+
+
+class TaskStats(object):
+    """Running summary of the runtimes of a repeated task
+
+    Keeps the count, total, minimum and maximum runtime, along with a
+    log-spaced histogram from which quantiles are estimated with bounded
+    relative error. Memory use is fixed by `max_buckets`, regardless of
+    the number of runtimes added.
+
+    Parameters
+    ----------
+    relative_accuracy : float, optional (default: 0.01)
+        Relative error of the estimated quantiles
+    max_buckets : int, optional (default: 2048)
+        Maximum number of histogram buckets. If exceeded, the lowest buckets
+        are merged, losing accuracy only on the smallest runtimes.
+
+    Properties
+    ----------
+    count : int
+        Number of runtimes added
+    total : float
+        Sum of all runtimes
+    min : float
+        Shortest runtime
+    max : float
+        Longest runtime
+    mean : float
+        Mean runtime
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_buckets=2048):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = {}
+        self._zero = 0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def add(self, runtime):
+        """Add a runtime to the summary
+
+        Parameters
+        ----------
+        runtime : float
+            Runtime of a single call of the task
+        """
+        self.count += 1
+        self.total += runtime
+        if runtime < self.min:
+            self.min = runtime
+        if runtime > self.max:
+            self.max = runtime
+        if runtime > _MIN_RUNTIME:
+            bucket = math.ceil(math.log(runtime) / self._log_gamma)
+            buckets = self._buckets
+            try:
+                buckets[bucket] += 1
+            except KeyError:
+                buckets[bucket] = 1
+                if len(buckets) > self.max_buckets:
+                    self._collapse()
+        else:
+            self._zero += 1
+
+    def _collapse(self):
+        """Merge the two lowest buckets"""
+        lowest, second = sorted(self._buckets)[:2]
+        self._buckets[second] += self._buckets.pop(lowest)
+
+    def quantile(self, q):
+        """Estimate a quantile of the runtimes
+
+        Parameters
+        ----------
+        q : float
+            Quantile to estimate, between 0 and 1
+
+        Returns
+        -------
+        runtime : float
+            Estimated runtime at quantile `q`
+        """
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self._zero
+        if rank < seen:
+            return self.min
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if rank < seen:
+                estimate = 2 * self._gamma**bucket / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
@@ -0,0 +1,134 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+
+class TraceRecorder(object):
+    """Record tasks as a Chrome Trace Event timeline
+
+    Each task start and completion is written to `file` as soon as it happens,
+    so the timeline is never held in memory. The resulting JSON file can be
+    opened in Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+
+    Synchronous tasks are written as duration events on the track of the
+    thread that ran them, so nesting is shown as stacked spans. Asynchronous
+    tasks (from `TaskLogger.log_task_async`) are written as async events.
+
+    Parameters
+    ----------
+    file : str or file-like object possessing a `write()` method
+        Path of the trace file, or an open text stream
+    """
+
+    def __init__(self, file):
+        if isinstance(file, str):
+            self.file = open(file, "w")
+            self._close_file = True
+        else:
+            self.file = file
+            self._close_file = False
+        self._lock = threading.Lock()
+        self._threads = set()
+        self._separator = "[\n"
+        self.closed = False
+        atexit.register(self.close)
+
+    def _write(self, event):
+        with self._lock:
+            if self.closed:
+                return
+            tid = event["tid"]
+            if tid not in self._threads:
+                self._threads.add(tid)
+                self._write_event(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": event["pid"],
+                        "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+            self._write_event(event)
+
+    def _write_event(self, event):
+        self.file.write(self._separator + json.dumps(event, separators=(",", ":")))
+        self._separator = ",\n"
+
+    @staticmethod
+    def _event(task, phase):
+        ns = time.perf_counter_ns()
+        return {
+            "name": str(task),
+            "ph": phase,
+            # microseconds, with nanosecond precision
+            "ts": ns / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+
+    def begin(self, task):
+        """Record the start of a synchronous task
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+        """
+        self._write(self._event(task, "B"))
+
+    def end(self, task):
+        """Record the completion of a synchronous task
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+        """
+        self._write(self._event(task, "E"))
+
+    def begin_async(self, task, task_id):
+        """Record the start of an asynchronous task
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+        task_id : int
+            Identifier shared by the start and completion of the task
+        """
+        event = self._event(task, "b")
+        event["cat"] = "async"
+        event["id"] = task_id
+        self._write(event)
+
+    def end_async(self, task, task_id):
+        """Record the completion of an asynchronous task
+
+        Parameters
+        ----------
+        task : str
+            Name of the task
+        task_id : int
+            Identifier shared by the start and completion of the task
+        """
+        event = self._event(task, "e")
+        event["cat"] = "async"
+        event["id"] = task_id
+        self._write(event)
+
+    def close(self):
+        """Terminate the JSON array and close the file"""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            if self._separator == "[\n":
+                self.file.write(self._separator)
+            self.file.write("\n]\n")
+            if self._close_file:
+                self.file.close()
+            else:
+                self.file.flush()
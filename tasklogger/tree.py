@@ -0,0 +1,153 @@
+import atexit
+import threading
+
+
+class _Node(object):
+    """Runtimes of all calls of a task with the same path of parent tasks"""
+
+    __slots__ = ("task", "parent", "children", "count", "total", "self_time")
+
+    def __init__(self, task, parent):
+        self.task = task
+        self.parent = parent
+        self.children = {}
+        self.count = 0
+        self.total = 0
+        self.self_time = 0
+
+    @property
+    def path(self):
+        """Names of the task and its parents, outermost first"""
+        path = []
+        node = self
+        while node.parent is not None:
+            path.append(node.task)
+            node = node.parent
+        return path[::-1]
+
+
+class TaskTree(object):
+    """Runtimes of tasks aggregated by their path of parent tasks
+
+    Each completed task adds its runtime to the total time of its path, such
+    as `load;parse;tokenize` for a task "tokenize" run within "parse" within
+    "load", and its runtime minus that of its children to the self time of
+    its path. Memory use is bounded by the number of distinct paths, not by
+    the number of calls, so a tree can be kept for long-running programs.
+
+    Parameters
+    ----------
+    path : str, optional (default: None)
+        If given, write the tree to this file at exit in collapsed stack
+        format, see `write_collapsed`
+    """
+
+    def __init__(self, path=None):
+        self.root = _Node(None, None)
+        self._lock = threading.Lock()
+        self.path = path
+        if path is not None:
+            atexit.register(self.write_collapsed, path)
+
+    def child(self, parent, task):
+        """Get the node of a task started within `parent`
+
+        Parameters
+        ----------
+        parent : node or None
+            Node of the parent task, or None for a task without parent
+        task : str
+            Name of the task
+
+        Returns
+        -------
+        node
+        """
+        if parent is None:
+            parent = self.root
+        try:
+            return parent.children[task]
+        except KeyError:
+            with self._lock:
+                return parent.children.setdefault(task, _Node(task, parent))
+
+    def add(self, node, runtime, child_time):
+        """Add a completed task to its node
+
+        Parameters
+        ----------
+        node : node
+            Node returned by `child` when the task started
+        runtime : float
+            Runtime of the task
+        child_time : float
+            Total runtime of the children of the task
+        """
+        with self._lock:
+            node.count += 1
+            node.total += runtime
+            node.self_time += runtime - child_time
+
+    def nodes(self):
+        """Iterate over the nodes of the tree, parents before children
+
+        Returns
+        -------
+        nodes : iterator
+            Nodes with attributes `task`, `path`, `parent`, `children`,
+            `count`, `total` and `self_time`
+        """
+        with self._lock:
+            stack = list(self.root.children.values())[::-1]
+            nodes = []
+            while stack:
+                node = stack.pop()
+                nodes.append(node)
+                stack.extend(list(node.children.values())[::-1])
+        return iter(nodes)
+
+    def critical_path(self):
+        """Get the path which contributes most to the total time
+
+        Starting from the tasks without parent, follows the child with the
+        largest total time at each level.
+
+        Returns
+        -------
+        nodes : list
+            Nodes on the critical path, outermost first
+        """
+        nodes = []
+        with self._lock:
+            node = self.root
+            while node.children:
+                node = max(node.children.values(), key=lambda child: child.total)
+                nodes.append(node)
+        return nodes
+
+    def write_collapsed(self, file):
+        """Write the self time of each path in collapsed stack format
+
+        Each line holds a path of task names separated by semicolons and its
+        self time in microseconds, as read by flamegraph.pl
+        (https://github.com/brendangregg/FlameGraph) and speedscope
+        (https://www.speedscope.app).
+
+        Parameters
+        ----------
+        file : str or file-like object possessing a `write()` method
+            Path of the file, or an open text stream
+        """
+        lines = []
+        for node in self.nodes():
+            microseconds = int(round(node.self_time * 1e6))
+            if microseconds > 0:
+                path = ";".join(
+                    str(task).replace(";", ",").replace("\n", " ") for task in node.path
+                )
+                lines.append("{} {}\n".format(path, microseconds))
+        if isinstance(file, str):
+            with open(file, "w") as handle:
+                handle.writelines(lines)
+        else:
+            file.writelines(lines)
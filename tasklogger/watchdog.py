@@ -0,0 +1,186 @@
+import logging
+import sys
+import threading
+import time
+import weakref
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_watchdog():
+    """Get the watchdog shared by all TaskLoggers
+
+    Returns
+    -------
+    watchdog : Watchdog
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Watchdog()
+        return _shared
+
+
+def format_elapsed(seconds):
+    """Format a duration in seconds, minutes and hours
+
+    Parameters
+    ----------
+    seconds : float
+        Duration in seconds
+
+    Returns
+    -------
+    formatted : str
+        e.g. "45s", "5m" or "2h 5m", rounded down
+    """
+    seconds = int(seconds)
+    if seconds < 60:
+        return "{}s".format(seconds)
+    minutes = seconds // 60
+    if minutes < 60:
+        return "{}m".format(minutes)
+    return "{}h {}m".format(minutes // 60, minutes % 60)
+
+
+class Watchdog(object):
+    """Thread which reports tasks that have been running for a long time
+
+    A single watchdog thread is shared by the TaskLoggers which enable it
+    with `TaskLogger.set_watchdog`. Every `tick` seconds, it scans the
+    synchronous tasks running in every thread of these TaskLoggers, and logs
+    "Still calculating X (elapsed 5m)..." for each task running for longer
+    than the TaskLogger's `after` seconds, then again whenever its running
+    time has grown by a factor `growth`. No thread is started per task, and
+    each scan takes time proportional to the number of running tasks.
+
+    The watchdog also prints the start messages held back by
+    `TaskLogger.set_defer_start` once a task has run for `min_runtime`,
+    including for TaskLoggers which defer start messages without enabling
+    `set_watchdog`.
+
+    Running times are measured from the first scan which sees a task, so
+    they are underestimated by up to `tick` seconds.
+
+    Parameters
+    ----------
+    tick : float, optional (default: 1)
+        Time in seconds between scans
+    """
+
+    def __init__(self, tick=1):
+        self.tick = tick
+        self._loggers = weakref.WeakSet()
+        self._lock = threading.Lock()
+        # running `TaskHandle`s mapped to [first seen, next heartbeat]
+        self._seen = {}
+        self._thread = None
+
+    def add(self, tasklogger):
+        """Start watching the tasks of a TaskLogger
+
+        Parameters
+        ----------
+        tasklogger : TaskLogger
+        """
+        with self._lock:
+            self._loggers.add(tasklogger)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tasklogger-watchdog", daemon=True
+                )
+                self._thread.start()
+
+    def discard(self, tasklogger):
+        """Stop watching the tasks of a TaskLogger
+
+        Parameters
+        ----------
+        tasklogger : TaskLogger
+        """
+        with self._lock:
+            self._loggers.discard(tasklogger)
+
+    def _run(self):
+        while True:
+            time.sleep(self.tick)
+            with self._lock:
+                loggers = list(self._loggers)
+                if not loggers:
+                    # restarted by the next call to `add`
+                    self._thread = None
+                    self._seen = {}
+                    return
+            self.check(loggers, time.monotonic())
+
+    def check(self, loggers, now):
+        """Scan the running tasks of `loggers` once
+
+        Parameters
+        ----------
+        loggers : list of TaskLogger
+            TaskLoggers whose tasks are scanned
+        now : float
+            Current value of `time.monotonic`
+        """
+        seen = {}
+        frames = None
+        for tasklogger in loggers:
+            settings = tasklogger._watchdog
+            if settings is not None:
+                after, growth, stacks = settings
+            elif tasklogger.defer_start:
+                # only print deferred start messages
+                after, growth, stacks = None, None, False
+            else:
+                continue
+            enabled = not tasklogger.aggregate and tasklogger._is_enabled(logging.INFO)
+            for thread, stack in tasklogger._running():
+                overdue = False
+                for handle in list(stack):
+                    try:
+                        state = seen[handle] = self._seen[handle]
+                    except KeyError:
+                        seen[handle] = [now, None if after is None else now + after]
+                        continue
+                    if not enabled:
+                        continue
+                    first_seen, next_heartbeat = state
+                    if next_heartbeat is None and after is not None:
+                        # first seen before `set_watchdog` was called
+                        next_heartbeat = state[1] = first_seen + after
+                    elapsed = now - first_seen
+                    if handle.message is not None and elapsed >= tasklogger.min_runtime:
+                        tasklogger._write_start(handle)
+                    if next_heartbeat is not None and now >= next_heartbeat:
+                        state[1] = first_seen + (next_heartbeat - first_seen) * growth
+                        tasklogger._write(
+                            logging.INFO,
+                            "Still calculating {} (elapsed {})...".format(
+                                handle.task, format_elapsed(elapsed)
+                            ),
+                            handle.depth,
+                        )
+                        overdue = True
+                if overdue and stacks:
+                    if frames is None:
+                        frames = sys._current_frames()
+                    self._log_stack(tasklogger, thread, frames, stack)
+        self._seen = seen
+
+    @staticmethod
+    def _log_stack(tasklogger, thread, frames, stack):
+        """Log the current stack of the thread running overdue tasks"""
+        import traceback
+
+        frame = frames.get(thread.ident)
+        if frame is None:
+            return
+        depth = len(stack) + 1
+        tasklogger._write(
+            logging.INFO, "Stack of thread {}:".format(thread.name), depth - 1
+        )
+        for entry in traceback.format_stack(frame):
+            for line in entry.rstrip("\n").splitlines():
+                tasklogger._write(logging.INFO, line, depth)
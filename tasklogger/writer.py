@@ -0,0 +1,155 @@
+import collections
+import logging
+import threading
+import time
+
+OVERFLOW_POLICIES = ["block", "drop-oldest", "count-and-drop"]
+
+
+class BackgroundStreamHandler(logging.Handler):
+    """Logging handler which writes to a stream from a background thread
+
+    Formatted records are put on a bounded queue and returned from
+    immediately. A single writer thread takes everything queued so far,
+    writes it in a single call and flushes the stream at most every
+    `flush_interval` seconds. Remaining records are written when the handler
+    is closed, which `logging` does at exit.
+
+    Parameters
+    ----------
+    stream : file-like object possessing `write()` and `flush()` methods
+        Stream to which records are written
+    maxsize : int, optional (default: 10000)
+        Maximum number of records waiting to be written
+    overflow : {"block", "drop-oldest", "count-and-drop"}, \
+        optional (default: "block")
+        Behavior when the queue is full. If "block", wait for the writer to
+        catch up. If "drop-oldest", discard the oldest queued record. If
+        "count-and-drop", discard the new record. Dropped records are counted
+        and the count is written to the stream.
+    flush_interval : float, optional (default: 0.1)
+        Maximum time in seconds between a write and the next flush
+
+    Properties
+    ----------
+    dropped : int
+        Total number of records dropped due to overflow
+    """
+
+    terminator = "\n"
+
+    def __init__(self, stream, maxsize=10000, overflow="block", flush_interval=0.1):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                "Expected `overflow` in {}. Got {}".format(OVERFLOW_POLICIES, overflow)
+            )
+        super().__init__()
+        self.stream = stream
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue = collections.deque()
+        # number of records queued or being written
+        self._pending = 0
+        self._closed = False
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._thread = threading.Thread(
+            target=self._run, name="tasklogger-writer", daemon=True
+        )
+        self._thread.start()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        with self._mutex:
+            if self._closed:
+                self._write([msg])
+                return
+            queue = self._queue
+            if len(queue) >= self.maxsize:
+                if self.overflow == "block":
+                    while len(queue) >= self.maxsize and not self._closed:
+                        self._not_full.wait()
+                elif self.overflow == "drop-oldest":
+                    queue.popleft()
+                    self._pending -= 1
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    return
+            queue.append(msg)
+            self._pending += 1
+            self._not_empty.notify()
+
+    def _write(self, batch):
+        dropped = self.dropped - self._reported_dropped
+        if dropped:
+            batch.append(
+                "{} log messages dropped by {}{}".format(
+                    dropped, type(self).__name__, self.terminator
+                )
+            )
+            self._reported_dropped += dropped
+        try:
+            self.stream.write("".join(batch))
+        except Exception:
+            self.handleError(None)
+
+    def _flush_stream(self):
+        try:
+            self.stream.flush()
+        except Exception:
+            self.handleError(None)
+
+    def _run(self):
+        dirty = False
+        last_flush = time.monotonic()
+        while True:
+            with self._mutex:
+                if not self._queue and not self._closed:
+                    self._not_empty.wait(self.flush_interval if dirty else None)
+                batch = list(self._queue)
+                self._queue.clear()
+                self._not_full.notify_all()
+                closed = self._closed
+            if batch or self.dropped > self._reported_dropped:
+                self._write(batch)
+                dirty = True
+            now = time.monotonic()
+            if dirty and (not batch or now - last_flush >= self.flush_interval):
+                self._flush_stream()
+                dirty = False
+                last_flush = now
+            with self._mutex:
+                self._pending -= len(batch)
+                self._not_full.notify_all()
+            if closed:
+                return
+
+    def flush(self):
+        """Wait for all queued records to be written, then flush the stream"""
+        with self._mutex:
+            while self._pending > 0 and self._thread.is_alive():
+                self._not_full.wait(self.flush_interval)
+        self._flush_stream()
+
+    def close(self):
+        """Write all queued records and stop the writer thread"""
+        with self._mutex:
+            self._closed = True
+            self._not_empty.notify()
+            self._not_full.notify_all()
+        self._thread.join()
+        with self._mutex:
+            if self._queue:
+                self._write(list(self._queue))
+                self._queue.clear()
+        self._flush_stream()
+        super().close()
@@ -3,6 +3,7 @@ import numpy as np
 import platform
 import sys
 import tasklogger
+import threading
 import time
 
 
@@ -62,3 +63,53 @@ def test_context():
     with tasklogger.log_task("test", logger="test_context_api"):
         assert "test" in logger.tasks
     assert "test" not in logger.tasks
+
+
+def test_aggregate():
+    logger = tasklogger.TaskLogger("test_aggregate_api")
+    tasklogger.set_aggregate(logger="test_aggregate_api")
+    with tasklogger.log_task("test", logger="test_aggregate_api"):
+        pass
+    assert logger.stats["test"].count == 1
+    tasklogger.log_summary(reset=True, logger="test_aggregate_api")
+    assert logger.stats == {}
+
+
+def test_timed():
+    logger = tasklogger.TaskLogger("test_timed_api")
+
+    @tasklogger.timed(name="test", logger="test_timed_api")
+    def func():
+        assert "test" in logger.tasks
+
+    func()
+    assert "test" not in logger.tasks
+
+
+def test_get_logger_registry():
+    logger = tasklogger.TaskLogger("test_get_logger_registry")
+    assert tasklogger.get_tasklogger("test_get_logger_registry") is logger
+    logger_ignore = tasklogger.TaskLogger(
+        "test_get_logger_registry", if_exists="ignore"
+    )
+    assert tasklogger.get_tasklogger("test_get_logger_registry") is logger
+    assert logger_ignore.logger is logger.logger
+    logger_1 = tasklogger.TaskLogger("test_get_logger_registry", if_exists="increment")
+    assert tasklogger.get_tasklogger("test_get_logger_registry_1") is logger_1
+
+
+def test_get_logger_threads():
+    barrier = threading.Barrier(8)
+    loggers = []
+
+    def get():
+        barrier.wait()
+        loggers.append(tasklogger.get_tasklogger("test_get_logger_threads"))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loggers) == 8
+    assert all(logger is loggers[0] for logger in loggers)
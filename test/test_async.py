@@ -0,0 +1,96 @@
+import asyncio
+import io
+import tasklogger
+
+
+def test_log_task_async():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_log_task_async", stream=stream, min_runtime=0)
+
+    async def work(i):
+        async with logger.log_task_async("outer"):
+            await asyncio.sleep(0.01)
+            async with logger.log_task_async("inner {}".format(i)):
+                await asyncio.sleep(0.01 * (i + 1))
+            assert logger._async_tasks.get() == ("outer",)
+
+    async def main():
+        await asyncio.gather(work(0), work(1))
+        assert logger._async_tasks.get() == ()
+
+    asyncio.run(main())
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 8
+    for line in lines:
+        if "outer" in line:
+            assert not line.startswith(" ")
+        else:
+            assert line.startswith("  Calculat")
+    assert lines[-1].startswith("Calculated outer in")
+
+
+def test_log_task_async_nested_sync():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_log_task_async_nested_sync", stream=stream, min_runtime=0
+    )
+
+    async def main():
+        async with logger.log_task_async("outer"):
+            with logger.log_task("inner"):
+                pass
+
+    asyncio.run(main())
+    lines = stream.getvalue().splitlines()
+    assert lines[1] == "  Calculating inner..."
+
+
+def test_log_task_async_nested_defer_start():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_log_task_async_nested_defer_start",
+        stream=stream,
+        min_runtime=0,
+        defer_start=True,
+    )
+
+    async def main():
+        async with logger.log_task_async("outer"):
+            with logger.log_task("inner") as handle:
+                assert handle.depth == 1
+                logger.log_info("message")
+
+    asyncio.run(main())
+    logger.set_defer_start(False)
+    lines = stream.getvalue().splitlines()
+    assert lines[1:3] == ["  Calculating inner...", "    message"]
+    assert lines[3].startswith("  Calculated inner in ")
+
+
+def test_api_log_task_async():
+    stream = io.StringIO()
+    tasklogger.TaskLogger("test_api_log_task_async", stream=stream, min_runtime=0)
+
+    async def main():
+        async with tasklogger.log_task_async("test", logger="test_api_log_task_async"):
+            pass
+
+    asyncio.run(main())
+    assert stream.getvalue().startswith("Calculating test...\nCalculated test in")
+
+
+def test_timed_async():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_timed_async", stream=stream, min_runtime=0)
+
+    @logger.timed(name="test")
+    async def func(x):
+        assert logger._async_tasks.get() == ("test",)
+        await asyncio.sleep(0)
+        return x + 1
+
+    async def main():
+        return await asyncio.gather(func(0), func(1))
+
+    assert asyncio.run(main()) == [1, 2]
+    assert stream.getvalue().count("Calculated test in") == 2
@@ -0,0 +1,69 @@
+import concurrent.futures
+import functools
+import io
+import multiprocessing
+import queue
+import tasklogger
+
+
+def work(i, logger):
+    with tasklogger.log_task("work", logger=logger):
+        tasklogger.log_info("info {}".format(i), logger=logger)
+        tasklogger.log_warning("warning {}".format(i), logger=logger)
+    return i
+
+
+def test_collector():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_collector", stream=stream, min_runtime=0)
+    with logger.log_task("pool"):
+        with tasklogger.TaskCollector("test_collector") as collector:
+            with multiprocessing.Pool(
+                2, initializer=collector.initializer, initargs=collector.initargs
+            ) as pool:
+                results = pool.map(
+                    functools.partial(work, logger="test_collector"), range(4)
+                )
+                pool.close()
+                pool.join()
+    assert results == list(range(4))
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Calculating pool..."
+    assert lines[-1].startswith("Calculated pool in")
+    worker_lines = lines[1:-1]
+    assert len(worker_lines) == 4 * 4
+    for line in worker_lines:
+        assert line.startswith("  [worker ")
+    assert sum("]   warning" in line for line in worker_lines) == 4
+    assert sum("] Calculated work in" in line for line in worker_lines) == 4
+
+
+def test_collector_summary():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_collector_summary", stream=stream)
+    with tasklogger.TaskCollector(logger, summary=True) as collector:
+        with concurrent.futures.ProcessPoolExecutor(
+            2, initializer=collector.initializer, initargs=collector.initargs
+        ) as pool:
+            results = pool.map(
+                functools.partial(work, logger="test_collector_summary"), range(4)
+            )
+            assert list(results) == list(range(4))
+    assert sum(summary.count for summary in logger.stats.values()) == 4
+    assert all(task.startswith("work [worker ") for task in logger.stats)
+    lines = stream.getvalue().splitlines()
+    assert sum("warning" in line for line in lines) == 4
+    assert not any("info" in line for line in lines)
+    assert lines[4].split()[0] == "Task"
+
+
+def test_init_worker():
+    logger = tasklogger.TaskLogger("test_init_worker", min_runtime=0)
+    records = queue.Queue()
+    tasklogger.collector.init_worker(records, "test_init_worker")
+    assert logger._forward is None
+    work(0, "test_init_worker")
+    kinds = [records.get_nowait()[0] for _ in range(records.qsize())]
+    assert kinds == ["log"] * 4
+    tasklogger.collector.init_worker(records, "test_init_worker", summary=True)
+    assert logger._forward is records
@@ -0,0 +1,86 @@
+import concurrent.futures
+import io
+import tasklogger
+import threading
+import time
+
+
+def square(x):
+    return x * x
+
+
+def fail(x):
+    raise ValueError(x)
+
+
+def test_executor():
+    stream = io.StringIO()
+    tasklogger.TaskLogger("test_executor", stream=stream)
+    with tasklogger.TaskExecutor(
+        concurrent.futures.ThreadPoolExecutor(2), logger="test_executor"
+    ) as executor:
+        futures = [executor.submit(time.sleep, 0.1) for _ in range(4)]
+    assert all(future.done() for future in futures)
+    assert executor.run.count == 4
+    assert executor.wait.count == 4
+    assert executor.failed == 0
+    assert executor.run.min >= 0.09
+    # the last two jobs wait for the first two to finish
+    assert executor.wait.max >= 0.09
+    assert 0.5 < executor.utilization() <= 1.01
+    output = stream.getvalue()
+    assert output.startswith("4 jobs in ")
+    assert "; queue wait mean " in output
+    assert "; run time mean " in output
+    assert "utilization of 2 workers." in output
+
+
+def test_executor_exception():
+    stream = io.StringIO()
+    tasklogger.TaskLogger("test_executor_exception", stream=stream)
+    with tasklogger.TaskExecutor(
+        concurrent.futures.ThreadPoolExecutor(1),
+        logger="test_executor_exception",
+        name="checks",
+    ) as executor:
+        future = executor.submit(fail, 1)
+        try:
+            future.result()
+        except ValueError as exc:
+            assert exc.args == (1,)
+        else:
+            raise AssertionError("Expected ValueError")
+    assert executor.failed == 1
+    assert stream.getvalue().startswith("1 checks in ")
+    assert " (1 failed)" in stream.getvalue()
+
+
+def test_executor_cancel():
+    event = threading.Event()
+    executor = tasklogger.TaskExecutor(
+        concurrent.futures.ThreadPoolExecutor(1), logger="test_executor_cancel"
+    )
+    running = executor.submit(event.wait)
+    queued = executor.submit(square, 2)
+    assert queued.cancel()
+    event.set()
+    executor.shutdown()
+    assert queued.cancelled()
+    assert running.result() is True
+    assert executor.run.count == 1
+
+
+def test_executor_process_pool():
+    stream = io.StringIO()
+    tasklogger.TaskLogger("test_executor_process_pool", stream=stream)
+    with tasklogger.TaskExecutor(
+        concurrent.futures.ProcessPoolExecutor(2),
+        logger="test_executor_process_pool",
+    ) as executor:
+        assert list(executor.map(square, range(4))) == [0, 1, 4, 9]
+        future = executor.submit(fail, 2)
+        assert isinstance(future.exception(), ValueError)
+    assert executor.run.count == 5
+    assert executor.failed == 1
+    assert executor.wait.min >= 0
+    assert "utilization of 2 workers." in stream.getvalue()
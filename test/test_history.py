@@ -0,0 +1,91 @@
+import io
+import numpy as np
+import os
+import sqlite3
+import tasklogger
+import tempfile
+
+
+def test_history():
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "history.db")
+        history = tasklogger.history.RuntimeHistory(path, window=10, batch_size=3)
+        for runtime in [1.0, 1.1, 0.9, 1.0]:
+            assert history.add("test", runtime) is None
+        # not enough runtimes in the baseline
+        assert history.add("test", 100) is None
+        assert history.baseline("test")[0] == 5
+        history.close()
+        history.close()
+        assert history.add("test", 1) is None
+        with sqlite3.connect(path) as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM runtimes").fetchone()
+        assert count == 5
+        history = tasklogger.history.RuntimeHistory(
+            path, window=4, sigma=None, threshold=0.5, min_count=4
+        )
+        count, mean, std = history.baseline("test")
+        assert count == 4
+        np.testing.assert_allclose(mean, (1.1 + 0.9 + 1.0 + 100) / 4)
+        for runtime in [1.0] * 4:
+            history.add("test", runtime)
+        assert history.baseline("test")[1:] == (1.0, 0.0)
+        assert history.add("test", 1.4) is None
+        regression = history.add("test", 1.7)
+        assert regression[0] == 4
+        np.testing.assert_allclose(regression[1], 1.1)
+        history.close()
+        # either sigma or threshold flags a regression
+        history = tasklogger.history.RuntimeHistory(
+            os.path.join(tempdir, "both.db"), sigma=3, threshold=0.2, min_count=4
+        )
+        for runtime in [1.0, 1.2, 0.8, 1.0, 1.1]:
+            assert history.add("test", runtime) is None
+        # within 3 standard deviations, but more than 20% slower than the mean
+        assert history.add("test", 1.3) is not None
+        history.close()
+    np.testing.assert_raises(
+        ValueError, tasklogger.history.RuntimeHistory, path, sigma=None
+    )
+
+
+def test_history_logger():
+    stream = io.StringIO()
+    clock = [0]
+    logger = tasklogger.TaskLogger(
+        "test_history_logger", stream=stream, timer=lambda: clock[0]
+    )
+    with tempfile.TemporaryDirectory() as tempdir:
+        logger.set_history(os.path.join(tempdir, "history.db"))
+        history = logger.history
+        for runtime in [1, 1.1, 0.9, 1, 1.1, 0.9, 5]:
+            with logger.log_task("test"):
+                clock[0] += runtime
+        history.close()
+    logger.set_history(None)
+    lines = stream.getvalue().splitlines()
+    assert lines[-2] == "Calculated test in 5.00 seconds."
+    assert lines[-1] == (
+        "test took 5.00 seconds, slower than its mean of 1.00 "
+        "+/- 0.09 seconds over the last 6 runs."
+    )
+    assert sum("slower" in line for line in lines) == 1
+
+
+def test_history_min_runtime():
+    stream = io.StringIO()
+    clock = [0]
+    logger = tasklogger.TaskLogger(
+        "test_history_min_runtime", stream=stream, timer=lambda: clock[0]
+    )
+    with tempfile.TemporaryDirectory() as tempdir:
+        logger.set_history(os.path.join(tempdir, "history.db"))
+        history = logger.history
+        # far slower than usual, but below min_runtime
+        for runtime in [1e-6] * 6 + [1e-3]:
+            with logger.log_task("tiny"):
+                clock[0] += runtime
+        assert history.baseline("tiny")[0] == 7
+        history.close()
+    logger.set_history(None)
+    assert "slower" not in stream.getvalue()
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+
+# modules which are slow to import and only needed by optional features
+LAZY_MODULES = [
+    "deprecated",
+    "wrapt",
+    "multiprocessing",
+    "tracemalloc",
+    "inspect",
+    "sqlite3",
+]
+
+
+def _import_times(module):
+    """Import `module` in a new interpreter and parse `python -X importtime`
+
+    Returns
+    -------
+    times : dict
+        Cumulative import time in microseconds of each imported module
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time():
+    times = _import_times("tasklogger")
+    assert "tasklogger" in times
+    for module in LAZY_MODULES:
+        assert module not in times, "{} imported by tasklogger".format(module)
+
+
+def test_import_deprecated():
+    times = _import_times("tasklogger; tasklogger.TaskLogger.debug")
+    assert "deprecated" in times
@@ -1,7 +1,12 @@
+import gc
+import io
 import logging
 import numpy as np
 import tasklogger
+import threading
 import time
+import warnings
+import weakref
 
 
 def test_tasks():
@@ -110,3 +115,376 @@ def test_exists():
     assert logger_3.logger == logger.logger
     with np.testing.assert_raises(ValueError):
         tasklogger.TaskLogger("test_exists", if_exists="bad_value")
+
+
+def test_shared_level():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_shared_level", stream=stream, level=0)
+    logger.log_info("before")
+    tasklogger.TaskLogger("test_shared_level", if_exists="ignore", level=1)
+    logger.log_info("after")
+    logger.logger.setLevel(logging.WARNING)
+    logger.log_info("hidden")
+    assert stream.getvalue() == "after\n"
+
+
+def test_suppressed_no_format():
+    class Task:
+        formatted = 0
+
+        def __format__(self, spec):
+            Task.formatted += 1
+            return "task"
+
+    task = Task()
+    logger = tasklogger.TaskLogger("test_suppressed_no_format", level=0, min_runtime=0)
+    logger.start_task(task)
+    logger.complete_task(task)
+    assert Task.formatted == 0
+    logger.set_level(1)
+    logger.start_task(task)
+    logger.complete_task(task)
+    assert Task.formatted == 2
+
+
+def test_threads():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_threads", stream=stream, min_runtime=0)
+    barrier = threading.Barrier(2)
+    runtimes = {}
+
+    def work(i):
+        with logger.log_task("outer {}".format(i)):
+            barrier.wait()
+            logger.start_task("inner")
+            barrier.wait()
+            time.sleep(0.01 * (i + 1))
+            runtimes[i] = logger.complete_task("inner")
+            barrier.wait()
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert runtimes[0] < runtimes[1]
+    assert logger.tasks == {}
+    for line in stream.getvalue().splitlines():
+        if "outer" in line:
+            assert not line.startswith(" ")
+        else:
+            assert line.startswith("  Calculat")
+
+
+def test_ns_timers():
+    logger = tasklogger.TaskLogger("test_ns_timers")
+    for timer in ["perf", "monotonic"]:
+        logger.set_timer(timer)
+        logger.start_task("test")
+        assert isinstance(logger.tasks["test"], int)
+        time.sleep(logger.min_runtime)
+        runtime = logger.complete_task("test")
+        assert logger.min_runtime <= runtime < 1
+    logger.set_timer("thread")
+    assert logger.timer == time.thread_time_ns
+    logger.start_task("test")
+    time.sleep(logger.min_runtime * 10)
+    runtime = logger.complete_task("test")
+    assert runtime < logger.min_runtime * 10
+
+
+def test_aggregate():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_aggregate", stream=stream, min_runtime=0, aggregate=True
+    )
+    for _ in range(100):
+        with logger.log_task("test"):
+            pass
+    assert stream.getvalue() == ""
+    assert logger.stats["test"].count == 100
+    logger.log_summary(reset=True)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].split() == [
+        "Task",
+        "count",
+        "total",
+        "mean",
+        "min",
+        "p50",
+        "p95",
+        "p99",
+        "max",
+    ]
+    assert lines[1].split()[:2] == ["test", "100"]
+    assert logger.stats == {}
+    logger.set_aggregate(False)
+    logger.start_task("test")
+    assert logger.complete_task("test") is not None
+    assert logger.stats == {}
+    assert len(stream.getvalue().splitlines()) == 4
+
+
+def test_timed():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_timed", stream=stream, min_runtime=0)
+
+    @logger.timed
+    def func(x):
+        assert "test_timed.<locals>.func" in logger.tasks
+        return x + 1
+
+    class Test:
+        @logger.timed(name="method")
+        def method(self, x):
+            assert "method" in logger.tasks
+            return func(x)
+
+    assert func.__name__ == "func"
+    assert Test().method(1) == 2
+    assert logger.tasks == {}
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Calculating method..."
+    assert lines[1] == "  Calculating test_timed.<locals>.func..."
+    with np.testing.assert_raises(ValueError):
+
+        @logger.timed
+        def error():
+            raise ValueError()
+
+        error()
+    assert logger.tasks == {}
+
+
+def test_increment_many():
+    loggers = [
+        tasklogger.TaskLogger("test_increment_many", if_exists="increment")
+        for _ in range(2000)
+    ]
+    assert loggers[-1].name == "test_increment_many_1999"
+    assert "test_increment_many_2000" not in logging.Logger.manager.loggerDict
+    for logger in loggers:
+        logger.close()
+    assert "test_increment_many_1999" not in logging.Logger.manager.loggerDict
+    # closed names are free again
+    logger = tasklogger.TaskLogger("test_increment_many", if_exists="increment")
+    assert logger.name == "test_increment_many"
+    logger.close()
+
+
+def test_close():
+    stream = io.StringIO()
+    n_loggers = len(logging.Logger.manager.loggerDict)
+    with tasklogger.TaskLogger(
+        "test_close", stream=stream, aggregate=True, min_runtime=0
+    ) as logger:
+        with logger.log_task("test"):
+            pass
+        assert tasklogger.get_tasklogger("test_close") is logger
+        handler_ref = weakref.ref(logger.logger.handlers[0])
+    assert stream.getvalue().startswith("Task ")
+    assert len(logging.Logger.manager.loggerDict) == n_loggers
+    assert "test_close" not in tasklogger.logger._registry
+    logger_ref = weakref.ref(logger)
+    del logger
+    gc.collect()
+    assert logger_ref() is None
+    assert handler_ref() is None
+    logger = tasklogger.TaskLogger("test_close")
+    assert tasklogger.get_tasklogger("test_close") is logger
+
+
+def test_close_ignore():
+    logger = tasklogger.TaskLogger("test_close_ignore")
+    logger_ignore = tasklogger.TaskLogger("test_close_ignore", if_exists="ignore")
+    logger_ignore.close()
+    assert tasklogger.get_tasklogger("test_close_ignore") is logger
+    assert len(logger.logger.handlers) == 1
+    logger.close()
+    assert logger.logger.handlers == []
+
+
+def test_defer_start():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_defer_start", stream=stream, min_runtime=0.05, defer_start=True
+    )
+    for _ in range(100):
+        with logger.log_task("fast"):
+            pass
+    assert stream.getvalue() == ""
+    assert logger._local.pending == []
+    with logger.log_task("slow"):
+        time.sleep(0.05)
+    assert stream.getvalue().splitlines()[0] == "Calculating slow..."
+    assert stream.getvalue().splitlines()[1].startswith("Calculated slow in")
+    stream.seek(0)
+    stream.truncate()
+    with logger.log_task("outer"):
+        with logger.log_task("fast"):
+            pass
+        with logger.log_task("middle"):
+            logger.log_info("message")
+    lines = stream.getvalue().splitlines()
+    assert lines == ["Calculating outer...", "  Calculating middle...", "    message"]
+    # no start message for a task which completed while INFO was disabled
+    stream.seek(0)
+    stream.truncate()
+    logger.min_runtime = 0
+    logger.start_task("quiet")
+    logger.set_level(0)
+    logger.complete_task("quiet")
+    logger.set_level(1)
+    logger.log_info("later")
+    assert stream.getvalue() == "later\n"
+    assert logger._local.pending == []
+    logger.min_runtime = 0.05
+    logger.set_defer_start(False)
+    with logger.log_task("fast"):
+        pass
+    assert stream.getvalue().endswith("Calculating fast...\n")
+
+
+def test_defer_start_progress():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_defer_start_progress", stream=stream, min_runtime=0, defer_start=True
+    )
+    watchdog = tasklogger.watchdog.get_watchdog()
+    assert logger._watchdog is None
+    assert logger in watchdog._loggers
+    tick = watchdog.tick
+    watchdog.tick = 0.01
+    try:
+        with logger.log_task("slow"):
+            # the watchdog thread may be sleeping for a longer tick set before
+            for _ in range(500):
+                if stream.getvalue():
+                    break
+                time.sleep(0.01)
+            assert stream.getvalue() == "Calculating slow...\n"
+    finally:
+        watchdog.tick = tick
+    logger.set_defer_start(False)
+    assert logger not in watchdog._loggers
+
+
+def test_task_handle():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_task_handle", stream=stream, min_runtime=0)
+    outer = logger.start_task("recurse")
+    time.sleep(0.02)
+    inner = logger.start_task("recurse")
+    assert (outer.depth, inner.depth) == (0, 1)
+    assert logger.tasks["recurse"] == inner.start
+    inner_runtime = logger.complete_task(inner)
+    outer_runtime = logger.complete_task(outer)
+    assert outer_runtime >= inner_runtime + 0.02
+    assert logger.tasks == {}
+    np.testing.assert_raises(ValueError, logger.complete_task, outer)
+    # out of order completion
+    first = logger.start_task("first")
+    second = logger.start_task("second")
+    logger.complete_task(first)
+    assert list(logger.tasks) == ["second"]
+    logger.log_info("message")
+    assert stream.getvalue().endswith("\n  message\n")
+    logger.complete_task(second)
+    with logger.log_task("context") as handle:
+        assert isinstance(handle, tasklogger.logger.TaskHandle)
+        assert handle.task == "context"
+    np.testing.assert_raises(ValueError, logger.complete_task, handle)
+    # handles are completed in the thread which started them
+    handle = logger.start_task("other thread")
+    errors = []
+
+    def complete():
+        try:
+            logger.complete_task(handle)
+        except ValueError as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=complete)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+    assert logger.tasks == {"other thread": handle.start}
+    logger.complete_task(handle)
+    assert logger.tasks == {}
+
+
+def test_deprecated():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_deprecated", stream=stream, min_runtime=0)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        logger.info("info")
+        with logger.task("test"):
+            pass
+    assert [warning.category for warning in caught] == [DeprecationWarning] * 2
+    assert caught[0].filename == __file__
+    assert stream.getvalue().splitlines()[:2] == ["info", "Calculating test..."]
+    assert tasklogger.TaskLogger.debug.__name__ == "debug"
+    assert "log_debug" in tasklogger.TaskLogger.debug.__doc__
+
+
+def test_log_iter():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_log_iter", stream=stream, min_runtime=0)
+
+    def items():
+        for i in range(6):
+            time.sleep(0.01)
+            yield i
+
+    assert list(logger.log_iter(items(), "test", total=6, interval=0.025)) == list(
+        range(6)
+    )
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Calculating test..."
+    assert lines[1].startswith("  Calculating test: ")
+    assert " items (" in lines[1] and " seconds left" in lines[1]
+    assert lines[-1].startswith("Calculated test in ")
+    assert lines[-1].endswith(" items/s).")
+    assert logger.tasks == {}
+    stream.seek(0)
+    stream.truncate()
+    for i in logger.log_iter(range(10), "break", interval=0):
+        if i == 2:
+            break
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 4
+    assert lines[1].startswith("  Calculating break: 1/10 items (10%), ")
+    assert lines[2].startswith("  Calculating break: 2/10 items (20%), ")
+    assert lines[3].startswith("Calculated break in ")
+    assert logger.tasks == {}
+
+
+def test_format_count():
+    format_count = tasklogger.result.format_count
+    assert format_count(2) == "2"
+    assert format_count(999.4) == "999"
+    assert format_count(999.6) == "1k"
+    assert format_count(4712345) == "4.71M"
+    assert format_count(0.5) == "0.5"
+
+
+def test_throughput():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_throughput", stream=stream, min_runtime=0)
+    with logger.log_task("decode", items=4700000, nbytes=310 * 10**6, unit="rows"):
+        time.sleep(0.1)
+    line = stream.getvalue().splitlines()[-1]
+    assert line.startswith("Calculated decode in ")
+    assert " rows/s, " in line and line.endswith("B/s).")
+    with logger.log_task("parse") as parse:
+        time.sleep(0.01)
+        parse.nbytes = 1000
+    line = stream.getvalue().splitlines()[-1]
+    assert " kB/s)" in line and "items/s" not in line
+    with logger.log_task("none") as none:
+        none.items = 10
+    assert none.items == 10
+    for _ in logger.log_iter([1, 2], "iter", unit="files"):
+        time.sleep(0.01)
+    assert stream.getvalue().splitlines()[-1].endswith(" files/s).")
@@ -0,0 +1,105 @@
+import io
+import numpy as np
+import os
+import tasklogger
+import threading
+import tracemalloc
+
+
+def test_tracemalloc():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_tracemalloc", stream=stream, min_runtime=0, memory="tracemalloc"
+    )
+    assert tracemalloc.is_tracing()
+    logger.start_task("outer")
+    kept = bytearray(10**6)
+    logger.start_task("inner")
+    temporary = bytearray(5 * 10**6)
+    del temporary
+    inner = logger.complete_task("inner")
+    outer = logger.complete_task("outer")
+    assert isinstance(inner, tasklogger.result.TaskResult)
+    assert inner >= 0
+    assert 5 * 10**6 <= inner.memory_peak < 6 * 10**6
+    assert abs(inner.memory_net) < 10**5
+    assert 6 * 10**6 <= outer.memory_peak < 7 * 10**6
+    assert 10**6 <= outer.memory_net < 1.1 * 10**6
+    lines = stream.getvalue().splitlines()
+    assert lines[2].startswith("  Calculated inner in ")
+    assert "seconds (peak +5.0 MB, net " in lines[2]
+    assert "seconds (peak +6.0 MB, net +1.0 MB)." in lines[3]
+    del kept
+    logger.set_memory(None)
+    assert not tracemalloc.is_tracing()
+    logger.start_task("test")
+    assert not isinstance(logger.complete_task("test"), tasklogger.result.TaskResult)
+
+
+def test_tracemalloc_threads():
+    logger = tasklogger.TaskLogger(
+        "test_tracemalloc_threads", level=0, memory="tracemalloc"
+    )
+    allocated = threading.Event()
+    started = threading.Event()
+    results = []
+
+    def work():
+        logger.start_task("work")
+        temporary = bytearray(5 * 10**7)
+        del temporary
+        allocated.set()
+        # another thread starts a task, which resets the peak
+        started.wait()
+        results.append(logger.complete_task("work"))
+
+    def other():
+        allocated.wait()
+        with logger.log_task("other"):
+            started.set()
+
+    threads = [threading.Thread(target=work), threading.Thread(target=other)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.set_memory(None)
+    assert results[0].memory_peak >= 5 * 10**7
+
+
+def test_rss():
+    logger = tasklogger.TaskLogger("test_rss", level=0)
+    if not os.path.exists("/proc/self/statm"):
+        np.testing.assert_raises(RuntimeError, logger.set_memory, "rss")
+        return
+    logger.set_memory("rss")
+    with logger.log_task("outer"):
+        logger.start_task("inner")
+        data = np.ones(10**7)
+        inner = logger.complete_task("inner")
+    logger.start_task("outer")
+    del data
+    outer = logger.complete_task("outer")
+    assert inner.memory_peak >= 7 * 10**7
+    assert inner.memory_net >= 7 * 10**7
+    assert outer.memory_net <= -7 * 10**7
+    assert outer.memory_peak >= 0
+    logger.set_memory(None)
+
+
+def test_memory_untracked():
+    logger = tasklogger.TaskLogger("test_memory_untracked", level=0)
+    logger.start_task("test")
+    logger.set_memory("tracemalloc")
+    assert not isinstance(logger.complete_task("test"), tasklogger.result.TaskResult)
+    logger.set_memory(None)
+    np.testing.assert_raises(ValueError, logger.set_memory, "bad")
+
+
+def test_format_bytes():
+    format_bytes = tasklogger.result.format_bytes
+    assert format_bytes(999) == "999.0 B"
+    assert format_bytes(12345678) == "12.3 MB"
+    assert format_bytes(-2000, sign=True) == "-2.0 kB"
+    assert format_bytes(2000, sign=True) == "+2.0 kB"
+    assert format_bytes(5 * 10**15) == "5000.0 TB"
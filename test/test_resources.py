@@ -0,0 +1,47 @@
+import io
+import tasklogger
+import time
+
+
+def test_resources_timer():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_resources_timer", stream=stream, timer="resources", min_runtime=0
+    )
+    assert logger.timer is tasklogger.resources.ResourceUsage
+    logger.start_task("sleep")
+    time.sleep(0.1)
+    sleep = logger.complete_task("sleep")
+    logger.start_task("compute")
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.1:
+        pass
+    compute = logger.complete_task("compute")
+    for result in [sleep, compute]:
+        assert isinstance(result, tasklogger.result.TaskResult)
+        assert result == result.wall_time
+        assert result >= 0.1
+    assert sleep.cpu_ratio < 0.5
+    assert compute.cpu_ratio > 0.5
+    if tasklogger.resources.resource is not None:
+        assert sleep.voluntary_switches >= 1
+        for name in tasklogger.resources.RUSAGE_FIELDS:
+            assert getattr(compute, name) >= 0
+    lines = stream.getvalue().splitlines()
+    assert lines[1].startswith("Calculated sleep in 0.1")
+    assert " seconds (CPU 0.00 seconds, " in lines[1]
+    assert "context switches" in lines[3]
+
+
+def test_resources_memory():
+    logger = tasklogger.TaskLogger(
+        "test_resources_memory", timer="resources", memory="tracemalloc", level=0
+    )
+    with logger.log_task("test"):
+        pass
+    logger.start_task("test")
+    result = logger.complete_task("test")
+    logger.set_memory(None)
+    assert result.memory_peak >= 0
+    assert result.cpu_time >= 0
+    assert "CPU" in result.describe() and "peak" in result.describe()
@@ -0,0 +1,81 @@
+import io
+import numpy as np
+import tasklogger
+import time
+
+
+def test_every_n():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_every_n", stream=stream, min_runtime=0)
+    policy = tasklogger.sampling.EveryN(10)
+    runtimes = []
+    for _ in range(25):
+        logger.start_task("test", sample=policy)
+        runtimes.append(logger.complete_task("test"))
+    assert all(runtime is not None for runtime in runtimes)
+    assert logger.tasks == {}
+    assert logger._local.stack == []
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 6
+    assert lines[0] == "Calculating test..."
+    assert lines[2].startswith("Calculating test... (skipped 9 calls in ")
+    assert lines[4].startswith("Calculating test... (skipped 9 calls in ")
+    assert policy.pop_skipped("test")[0] == 4
+    np.testing.assert_raises(ValueError, tasklogger.sampling.EveryN, 0)
+
+
+def test_defer_start():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_sampling_defer_start", stream=stream, min_runtime=0.05, defer_start=True
+    )
+    policy = tasklogger.sampling.EveryN(5)
+    for _ in range(15):
+        with logger.log_task("test", sample=policy):
+            pass
+    assert stream.getvalue() == ""
+    # the sampled calls printed nothing, so they count as skipped
+    with logger.log_task("test", sample=policy):
+        time.sleep(0.05)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith("Calculating test... (skipped 15 calls in ")
+    assert lines[1].startswith("Calculated test in ")
+    logger.set_defer_start(False)
+
+
+def test_interval():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_interval", stream=stream, min_runtime=0)
+    policy = tasklogger.sampling.Interval(0.05)
+    for _ in range(10):
+        with tasklogger.log_task("test", logger="test_interval", sample=policy):
+            pass
+    time.sleep(0.05)
+    with logger.log_task("test", sample=policy):
+        with logger.log_task("other", sample=policy):
+            pass
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 6
+    assert lines[2].startswith("Calculating test... (skipped 9 calls in ")
+    assert lines[3] == "  Calculating other..."
+
+
+def test_token_bucket():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_token_bucket", stream=stream, min_runtime=0)
+    policy = tasklogger.sampling.TokenBucket(rate=0.01, burst=3)
+    for _ in range(10):
+        with logger.log_task("test", sample=policy):
+            pass
+    assert len(stream.getvalue().splitlines()) == 6
+
+
+def test_sample_aggregate():
+    logger = tasklogger.TaskLogger(
+        "test_sample_aggregate", stream=io.StringIO(), aggregate=True
+    )
+    policy = tasklogger.sampling.EveryN(10)
+    for _ in range(20):
+        with logger.log_task("test", sample=policy):
+            pass
+    assert logger.stats["test"].count == 20
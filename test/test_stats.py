@@ -0,0 +1,35 @@
+from tasklogger.stats import TaskStats
+
+import numpy as np
+
+
+def test_task_stats():
+    runtimes = np.random.RandomState(42).lognormal(-5, 1, size=10000)
+    stats = TaskStats()
+    for runtime in runtimes:
+        stats.add(runtime)
+    assert stats.count == len(runtimes)
+    np.testing.assert_allclose(stats.total, runtimes.sum())
+    np.testing.assert_allclose(stats.mean, runtimes.mean())
+    assert stats.min == runtimes.min()
+    assert stats.max == runtimes.max()
+    runtimes = np.sort(runtimes)
+    for q in [0, 0.5, 0.95, 0.99, 1]:
+        expected = runtimes[int(q * (len(runtimes) - 1))]
+        np.testing.assert_allclose(stats.quantile(q), expected, rtol=0.02)
+
+
+def test_task_stats_empty():
+    stats = TaskStats()
+    assert np.isnan(stats.mean)
+    assert np.isnan(stats.quantile(0.5))
+
+
+def test_task_stats_bounded():
+    stats = TaskStats(max_buckets=10)
+    for runtime in np.logspace(-12, 3, 1000):
+        stats.add(runtime)
+    assert len(stats._buckets) <= 10
+    assert stats._zero > 0
+    assert stats.quantile(0) == stats.min
+    np.testing.assert_allclose(stats.quantile(1), 1000, rtol=0.02)
@@ -0,0 +1,70 @@
+import asyncio
+import io
+import json
+import os
+import tasklogger
+import tempfile
+import threading
+
+
+def test_trace():
+    logger = tasklogger.TaskLogger("test_trace", level=0)
+    with tempfile.TemporaryDirectory() as tempdir:
+        filename = os.path.join(tempdir, "trace.json")
+        logger.set_trace(filename)
+        recorder = logger.trace
+        with logger.log_task("outer"):
+            with logger.log_task("inner"):
+                pass
+        thread = threading.Thread(target=lambda: logger.start_task("thread"))
+        thread.start()
+        thread.join()
+        logger.set_trace(None)
+        with logger.log_task("untraced"):
+            pass
+        recorder.close()
+        recorder.close()
+        with open(filename) as handle:
+            events = json.load(handle)
+    metadata = [event for event in events if event["ph"] == "M"]
+    assert len(metadata) == 2
+    assert metadata[0]["args"]["name"] == "MainThread"
+    events = [event for event in events if event["ph"] != "M"]
+    assert [(event["name"], event["ph"]) for event in events] == [
+        ("outer", "B"),
+        ("inner", "B"),
+        ("inner", "E"),
+        ("outer", "E"),
+        ("thread", "B"),
+    ]
+    assert events[0]["pid"] == os.getpid()
+    assert events[0]["tid"] == threading.get_ident()
+    assert events[4]["tid"] != threading.get_ident()
+    timestamps = [event["ts"] for event in events]
+    assert timestamps == sorted(timestamps)
+
+
+def test_trace_async():
+    stream = io.StringIO()
+    recorder = tasklogger.trace.TraceRecorder(stream)
+    logger = tasklogger.set_trace(recorder, logger="test_trace_async")
+
+    async def work():
+        async with logger.log_task_async("test"):
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(work(), work())
+
+    asyncio.run(main())
+    recorder.close()
+    events = [event for event in json.loads(stream.getvalue()) if event["ph"] != "M"]
+    assert [event["ph"] for event in events] == ["b", "b", "e", "e"]
+    assert events[0]["id"] == events[2]["id"]
+    assert events[0]["id"] != events[1]["id"]
+
+
+def test_trace_empty():
+    stream = io.StringIO()
+    tasklogger.trace.TraceRecorder(stream).close()
+    assert json.loads(stream.getvalue()) == []
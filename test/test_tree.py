@@ -0,0 +1,112 @@
+import io
+import numpy as np
+import os
+import tasklogger
+import tempfile
+import threading
+
+
+def _run(logger, clock):
+    def sleep(seconds):
+        clock[0] += seconds
+
+    for _ in range(2):
+        with logger.log_task("load"):
+            sleep(1)
+            with logger.log_task("parse"):
+                sleep(2)
+                with logger.log_task("tokenize"):
+                    sleep(3)
+            with logger.log_task("parse"):
+                sleep(1)
+
+
+def test_tree():
+    clock = [0]
+    logger = tasklogger.TaskLogger("test_tree", level=0, timer=lambda: clock[0])
+    logger.set_tree()
+    _run(logger, clock)
+    nodes = {";".join(node.path): node for node in logger.tree.nodes()}
+    assert list(nodes) == ["load", "load;parse", "load;parse;tokenize"]
+    assert nodes["load"].count == 2
+    assert nodes["load"].total == 14
+    assert nodes["load"].self_time == 2
+    assert nodes["load;parse"].count == 4
+    assert nodes["load;parse"].self_time == 6
+    assert nodes["load;parse;tokenize"].total == 6
+    stream = io.StringIO()
+    logger.tree.write_collapsed(stream)
+    assert stream.getvalue() == (
+        "load 2000000\nload;parse 6000000\nload;parse;tokenize 6000000\n"
+    )
+    tree = logger.tree
+    logger.set_tree(False)
+    with logger.log_task("untracked"):
+        pass
+    assert len(list(tree.nodes())) == 3
+
+
+def test_tree_threads():
+    logger = tasklogger.TaskLogger("test_tree_threads", level=0, timer="perf")
+    tree = tasklogger.tree.TaskTree()
+    logger.set_tree(tree)
+
+    def work():
+        for _ in range(100):
+            with logger.log_task("a;b"):
+                with logger.log_task("c"):
+                    pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    nodes = list(tree.nodes())
+    assert [node.count for node in nodes] == [400, 400]
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "tree.folded")
+        tree.write_collapsed(path)
+        with open(path) as handle:
+            for line in handle:
+                assert line.startswith("a,b")
+
+
+def test_log_tree():
+    stream = io.StringIO()
+    clock = [0]
+    logger = tasklogger.TaskLogger(
+        "test_log_tree", stream=stream, timer=lambda: clock[0], min_runtime=100
+    )
+    logger.log_tree()
+    assert stream.getvalue() == ""
+    logger.set_tree()
+    _run(logger, clock)
+    with logger.log_task("save"):
+        clock[0] += 1
+    stream.seek(0)
+    stream.truncate()
+    logger.log_tree()
+    lines = [line.split() for line in stream.getvalue().splitlines()]
+    assert lines[0] == [
+        "Task",
+        "count",
+        "total",
+        "self",
+        "children",
+        "%",
+        "parent",
+        "critical",
+    ]
+    assert lines[1:] == [
+        ["load;parse", "4", "12", "6", "6", "85.7%", "*"],
+        ["load;parse;tokenize", "2", "6", "6", "0", "50.0%", "*"],
+        ["load", "2", "14", "2", "12", "93.3%", "*"],
+        ["save", "1", "1", "1", "0", "6.7%"],
+        ["Critical", "path:", "load;parse;tokenize"],
+    ]
+    stream.seek(0)
+    stream.truncate()
+    tasklogger.log_tree(sort="total", logger="test_log_tree")
+    assert stream.getvalue().splitlines()[1].startswith("load ")
+    np.testing.assert_raises(ValueError, logger.log_tree, sort="bad")
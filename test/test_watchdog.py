@@ -0,0 +1,123 @@
+import gc
+import io
+import numpy as np
+import tasklogger
+import threading
+import time
+
+
+def test_heartbeat():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_heartbeat", stream=stream)
+    # settings of `set_watchdog`, without the shared watchdog thread
+    logger._watchdog = (60, 2, False)
+    watchdog = tasklogger.watchdog.Watchdog()
+    with logger.log_task("outer"):
+        logger.start_task("inner")
+        for now in [0, 59, 60, 119, 120, 240, 480]:
+            watchdog.check([logger], now)
+        logger.complete_task("inner")
+        watchdog.check([logger], 500)
+        assert len(watchdog._seen) == 1
+    watchdog.check([logger], 600)
+    assert watchdog._seen == {}
+    lines = stream.getvalue().splitlines()
+    assert lines[2:] == [
+        "Still calculating outer (elapsed 1m)...",
+        "  Still calculating inner (elapsed 1m)...",
+        "Still calculating outer (elapsed 2m)...",
+        "  Still calculating inner (elapsed 2m)...",
+        "Still calculating outer (elapsed 4m)...",
+        "  Still calculating inner (elapsed 4m)...",
+        "Still calculating outer (elapsed 8m)...",
+        "  Still calculating inner (elapsed 8m)...",
+    ]
+    np.testing.assert_raises(ValueError, logger.set_watchdog, growth=1)
+    assert logger not in tasklogger.watchdog.get_watchdog()._loggers
+
+
+def test_heartbeat_threads():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_heartbeat_threads", stream=stream, defer_start=True
+    )
+    # deferred start registers with the shared watchdog thread
+    tasklogger.watchdog.get_watchdog().discard(logger)
+    logger._watchdog = (1, 2, True)
+    watchdog = tasklogger.watchdog.Watchdog()
+    started = threading.Event()
+    done = threading.Event()
+
+    def work():
+        with logger.log_task("work"):
+            started.set()
+            done.wait()
+
+    thread = threading.Thread(target=work, name="worker")
+    thread.start()
+    started.wait()
+    watchdog.check([logger], 0)
+    assert stream.getvalue() == ""
+    watchdog.check([logger], 0.5)
+    assert stream.getvalue() == "Calculating work...\n"
+    watchdog.check([logger], 1)
+    done.set()
+    thread.join()
+    lines = stream.getvalue().splitlines()
+    assert lines[1] == "Still calculating work (elapsed 1s)..."
+    assert lines[2] == "  Stack of thread worker:"
+    assert any("in work" in line for line in lines[3:])
+    del thread
+    gc.collect()
+    assert len(logger._running()) == 1
+
+
+def test_shared_watchdog():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger("test_shared_watchdog", stream=stream)
+    watchdog = tasklogger.watchdog.get_watchdog()
+    tick = watchdog.tick
+    watchdog.tick = 0.01
+    try:
+        tasklogger.set_watchdog(after=0.05, logger="test_shared_watchdog")
+        with logger.log_task("slow"):
+            # the watchdog thread may be sleeping for a longer tick set before
+            for _ in range(500):
+                if "Still calculating" in stream.getvalue():
+                    break
+                time.sleep(0.01)
+    finally:
+        watchdog.tick = tick
+    logger.close()
+    assert "Still calculating slow (elapsed 0s)..." in stream.getvalue()
+    assert logger not in watchdog._loggers
+
+
+def test_format_elapsed():
+    format_elapsed = tasklogger.watchdog.format_elapsed
+    assert format_elapsed(59.9) == "59s"
+    assert format_elapsed(300) == "5m"
+    assert format_elapsed(7500) == "2h 5m"
+
+
+def test_deferred_start_once():
+    stream = io.StringIO()
+    logger = tasklogger.TaskLogger(
+        "test_deferred_start_once", stream=stream, min_runtime=0, defer_start=True
+    )
+    barrier = threading.Barrier(8)
+    with logger.log_task("work") as handle:
+
+        def write():
+            barrier.wait()
+            logger._write_start(handle)
+
+        threads = [threading.Thread(target=write) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.log_info("message")
+    logger.set_defer_start(False)
+    lines = stream.getvalue().splitlines()
+    assert lines[:2] == ["Calculating work...", "  message"]
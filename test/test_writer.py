@@ -0,0 +1,125 @@
+import io
+import numpy as np
+import subprocess
+import sys
+import tasklogger
+import threading
+
+
+class BlockingStream(io.StringIO):
+    """Stream whose writes wait until `release` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.writing = threading.Event()
+        self.writes = 0
+
+    def write(self, s):
+        self.writing.set()
+        self.release.wait()
+        self.writes += 1
+        return super().write(s)
+
+
+def test_background_output():
+    stream = BlockingStream()
+    logger = tasklogger.TaskLogger("test_background_output", stream=stream)
+    logger.set_background_output()
+    assert isinstance(
+        logger.logger.handlers[0], tasklogger.writer.BackgroundStreamHandler
+    )
+    for i in range(100):
+        logger.log_info(str(i))
+    stream.release.set()
+    logger.logger.handlers[0].flush()
+    assert stream.getvalue().splitlines() == [str(i) for i in range(100)]
+    assert stream.writes < 100
+    logger.set_background_output(False)
+    assert not isinstance(
+        logger.logger.handlers[0], tasklogger.writer.BackgroundStreamHandler
+    )
+    logger.log_info("sync")
+    assert stream.getvalue().endswith("99\nsync\n")
+
+
+def _fill(name, overflow):
+    stream = BlockingStream()
+    logger = tasklogger.TaskLogger(name, stream=stream)
+    logger.set_background_output(maxsize=5, overflow=overflow)
+    handler = logger.logger.handlers[0]
+    logger.log_info("first")
+    stream.writing.wait()
+    for i in range(20):
+        logger.log_info(str(i))
+    stream.release.set()
+    handler.close()
+    return handler, stream.getvalue().splitlines()
+
+
+def test_count_and_drop():
+    handler, lines = _fill("test_count_and_drop", "count-and-drop")
+    assert handler.dropped == 15
+    assert lines == ["first", "0", "1", "2", "3", "4"] + [
+        "15 log messages dropped by BackgroundStreamHandler"
+    ]
+
+
+def test_drop_oldest():
+    handler, lines = _fill("test_drop_oldest", "drop-oldest")
+    assert handler.dropped == 15
+    assert lines == ["first", "15", "16", "17", "18", "19"] + [
+        "15 log messages dropped by BackgroundStreamHandler"
+    ]
+
+
+def test_block():
+    stream = BlockingStream()
+    logger = tasklogger.TaskLogger("test_block", stream=stream)
+    logger.set_background_output(maxsize=5, overflow="block")
+    thread = threading.Thread(
+        target=lambda: [logger.log_info(str(i)) for i in range(20)]
+    )
+    thread.start()
+    thread.join(0.1)
+    assert thread.is_alive()
+    stream.release.set()
+    thread.join()
+    logger.logger.handlers[0].close()
+    assert stream.getvalue().splitlines() == [str(i) for i in range(20)]
+    logger.log_info("closed")
+    assert stream.getvalue().endswith("19\nclosed\n")
+
+
+def test_bad_overflow():
+    logger = tasklogger.TaskLogger("test_bad_overflow")
+    np.testing.assert_raises(ValueError, logger.set_background_output, overflow="bad")
+
+
+def test_background_output_exit():
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import tasklogger\n"
+            "tasklogger.set_background_output(flush_interval=10)\n"
+            "for i in range(1000):\n"
+            "    tasklogger.log_info(str(i))\n",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    assert output.decode().splitlines() == [str(i) for i in range(1000)]
+
+
+def test_api_background_output():
+    stream = io.StringIO()
+    tasklogger.TaskLogger("test_api_background_output", stream=stream)
+    logger = tasklogger.set_background_output(
+        overflow="drop-oldest", logger="test_api_background_output"
+    )
+    handler = logger.logger.handlers[0]
+    assert handler.overflow == "drop-oldest"
+    logger.log_info("test")
+    handler.flush()
+    assert stream.getvalue() == "test\n"